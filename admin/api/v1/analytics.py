@@ -14,7 +14,7 @@ from datetime import datetime, timedelta, timezone
 
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, cast, Float, Integer
+from sqlalchemy import func, case, cast, Float, Integer
 
 from admin.core.permissions import require_viewer, AdminUser
 from admin.models.admin import AuditLog, AdminUser as AdminUserModel
@@ -43,36 +43,26 @@ async def get_dashboard_stats(
             Response.response_timestamp >= yesterday
         ).count()
         
-        # Calculate DDS-2 specific metrics
-        # DDS-2 Average Distress Score (1-6 scale: 1=not a problem, 6=very serious problem)
-        avg_dds2_score = db.query(Response).filter(
+        # Calculate DDS-2 specific metrics in a single scan of the DDS-2 responses:
+        # - average distress score (1-6 scale: 1=not a problem, 6=very serious problem)
+        # - moderate (>= 3), high (>= 4) and very high (>= 5) distress counts
+        dds2_score = cast(Response.response_value, Integer)
+        dds2_row = db.query(
+            func.avg(cast(Response.response_value, Float)),
+            func.count(),
+            func.sum(case((dds2_score >= 3, 1), else_=0)),
+            func.sum(case((dds2_score >= 4, 1), else_=0)),
+            func.sum(case((dds2_score >= 5, 1), else_=0))
+        ).filter(
             Response.question_type.in_(['dds2_q1_overwhelmed', 'dds2_q2_failing'])
-        ).with_entities(
-            func.avg(cast(Response.response_value, Float))
-        ).scalar() or 2.0
+        ).one()
         
-        # DDS-2 Distress Level Classification
-        total_dds2_responses = db.query(Response).filter(
-            Response.question_type.in_(['dds2_q1_overwhelmed', 'dds2_q2_failing'])
-        ).count()
-        
-        # Moderate distress: DDS-2 score >= 3.0
-        moderate_distress = db.query(Response).filter(
-            Response.question_type.in_(['dds2_q1_overwhelmed', 'dds2_q2_failing']),
-            cast(Response.response_value, Integer) >= 3
-        ).count()
-        
-        # High distress: DDS-2 score >= 4.0
-        high_distress = db.query(Response).filter(
-            Response.question_type.in_(['dds2_q1_overwhelmed', 'dds2_q2_failing']),
-            cast(Response.response_value, Integer) >= 4
-        ).count()
-        
-        # Very high distress: DDS-2 score >= 5.0
-        very_high_distress = db.query(Response).filter(
-            Response.question_type.in_(['dds2_q1_overwhelmed', 'dds2_q2_failing']),
-            cast(Response.response_value, Integer) >= 5
-        ).count()
+        avg_dds2_score = dds2_row[0] or 2.0
+        total_dds2_responses = dds2_row[1]
+        # SUM over no rows is NULL
+        moderate_distress = int(dds2_row[2] or 0)
+        high_distress = int(dds2_row[3] or 0)
+        very_high_distress = int(dds2_row[4] or 0)
         
         moderate_distress_percentage = (moderate_distress / total_dds2_responses * 100) if total_dds2_responses > 0 else 0
         high_distress_percentage = (high_distress / total_dds2_responses * 100) if total_dds2_responses > 0 else 0
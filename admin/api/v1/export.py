@@ -7,15 +7,39 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, Query, HTTPException
 from fastapi.responses import StreamingResponse
+from sqlalchemy import Integer, case, cast, func
 from sqlalchemy.orm import Session
 import pandas as pd
 
 from admin.core.permissions import require_viewer, AdminUser, require_admin
+from database.constants import QuestionTypes, ResponseValues
 from database.database import get_db
 from database.models import User, Response
 
 router = APIRouter(tags=["export"])
 
+# Valid stored rating strings mapped to their level; anything else is skipped
+DDS2_LEVEL_BY_VALUE = {value: int(value) for value in ResponseValues.get_dds2_values()}
+LEGACY_SEVERITY_LEVEL_BY_VALUE = {value: int(value) for value in ResponseValues.get_rating_values()}
+
+# Labels for each rating level in the distribution sheets
+DDS2_LEVEL_LABELS = (
+    "Not a problem", "A slight problem", "A moderate problem", 
+    "Somewhat serious problem", "A serious problem", "A very serious problem"
+)
+LEGACY_SEVERITY_LABELS = ("Low", "Low-Medium", "Medium", "Medium-High", "High")
+
+# Question types with numeric (rating) answers, counted in the distribution sheets
+DISTRIBUTION_QUESTION_TYPES = QuestionTypes.get_dds2_types() + (QuestionTypes.SEVERITY_RATING,)
+
+
+def _round_averages(summary: pd.DataFrame) -> pd.DataFrame:
+    """Round the average columns of a summary sheet, showing 0 for empty buckets"""
+    average_columns = [column for column in summary.columns if column.startswith('Average')]
+    summary[average_columns] = summary[average_columns].fillna(0).round(2)
+    return summary
+
+
 @router.get("/responses")
 async def export_responses(
     format: str = Query("csv", description="Export format: csv or excel"),
@@ -164,8 +188,17 @@ async def export_patient_report(
     if not patient:
         raise HTTPException(status_code=404, detail="Patient not found")
     
-    # Get all patient responses
-    responses = db.query(Response).filter(
+    # Get all patient responses; rating answers come back already cast to int
+    responses = db.query(
+        Response.response_timestamp,
+        Response.question_type,
+        Response.response_value,
+        case(
+            (Response.question_type.in_(DISTRIBUTION_QUESTION_TYPES),
+             cast(Response.response_value, Integer)),
+            else_=None
+        ).label('score')
+    ).filter(
         Response.user_id == patient_id
     ).order_by(Response.response_timestamp.desc()).all()
     
@@ -200,129 +233,86 @@ async def export_patient_report(
     if responses_data:
         sheets_data['All Responses'] = pd.DataFrame(responses_data)
     
-    # Sheet 3: Daily Summary
-    daily_summary = {}
-    
-    for resp in responses:
-        date_key = resp.response_timestamp.date()
-        
-        if date_key not in daily_summary:
-            daily_summary[date_key] = {
-                'Date': date_key,
-                'Total Responses': 0,
-                'Distress Checks': 0,
-                'DDS-2 Q1 (Overwhelmed)': 0,
-                'DDS-2 Q2 (Failing)': 0,
-                'Legacy Severity Ratings': 0,
-                'Average DDS-2 Score': [],
-                'Average Legacy Severity': []
-            }
+    if responses:
+        # Bucket by day and by week in pandas rather than row-by-row dict loops
+        responses_df = pd.DataFrame.from_records(
+            responses, columns=['timestamp', 'question_type', 'response_value', 'score']
+        )
+        question_types = responses_df['question_type']
+        scores = pd.to_numeric(responses_df['score'])
+        dates = responses_df['timestamp'].dt.normalize()
         
-        daily_summary[date_key]['Total Responses'] += 1
+        responses_df['Date'] = dates.dt.date
+        # Week start date (Monday)
+        responses_df['Week Starting'] = (
+            dates - pd.to_timedelta(dates.dt.weekday, unit='D')
+        ).dt.date
+        responses_df['is_distress'] = question_types == QuestionTypes.DISTRESS_CHECK
+        responses_df['is_dds2_q1'] = question_types == QuestionTypes.DDS2_Q1_OVERWHELMED
+        responses_df['is_dds2_q2'] = question_types == QuestionTypes.DDS2_Q2_FAILING
+        responses_df['is_severity'] = question_types == QuestionTypes.SEVERITY_RATING
+        responses_df['dds2_score'] = scores.where(question_types.isin(QuestionTypes.get_dds2_types()))
+        responses_df['legacy_score'] = scores.where(responses_df['is_severity'])
         
-        if resp.question_type == 'distress_check':
-            daily_summary[date_key]['Distress Checks'] += 1
-        elif resp.question_type == 'dds2_q1_overwhelmed':
-            daily_summary[date_key]['DDS-2 Q1 (Overwhelmed)'] += 1
-            daily_summary[date_key]['Average DDS-2 Score'].append(int(resp.response_value))
-        elif resp.question_type == 'dds2_q2_failing':
-            daily_summary[date_key]['DDS-2 Q2 (Failing)'] += 1
-            daily_summary[date_key]['Average DDS-2 Score'].append(int(resp.response_value))
-        elif resp.question_type == 'severity_rating':
-            daily_summary[date_key]['Legacy Severity Ratings'] += 1
-            daily_summary[date_key]['Average Legacy Severity'].append(int(resp.response_value))
-    
-    # Calculate averages
-    daily_data = []
-    for date_key, data in sorted(daily_summary.items()):
-        avg_dds2_score = sum(data['Average DDS-2 Score']) / len(data['Average DDS-2 Score']) if data['Average DDS-2 Score'] else 0
-        avg_legacy_severity = sum(data['Average Legacy Severity']) / len(data['Average Legacy Severity']) if data['Average Legacy Severity'] else 0
-        daily_data.append({
-            'Date': data['Date'],
-            'Total Responses': data['Total Responses'],
-            'Distress Checks': data['Distress Checks'],
-            'DDS-2 Q1 (Overwhelmed)': data['DDS-2 Q1 (Overwhelmed)'],
-            'DDS-2 Q2 (Failing)': data['DDS-2 Q2 (Failing)'],
-            'Legacy Severity Ratings': data['Legacy Severity Ratings'],
-            'Average DDS-2 Score (1-6)': round(avg_dds2_score, 2),
-            'Average Legacy Severity (1-5)': round(avg_legacy_severity, 2)
+        # Sheet 3: Daily Summary
+        daily_summary = responses_df.groupby('Date').agg(**{
+            'Total Responses': ('question_type', 'size'),
+            'Distress Checks': ('is_distress', 'sum'),
+            'DDS-2 Q1 (Overwhelmed)': ('is_dds2_q1', 'sum'),
+            'DDS-2 Q2 (Failing)': ('is_dds2_q2', 'sum'),
+            'Legacy Severity Ratings': ('is_severity', 'sum'),
+            'Average DDS-2 Score (1-6)': ('dds2_score', 'mean'),
+            'Average Legacy Severity (1-5)': ('legacy_score', 'mean')
         })
-    
-    if daily_data:
-        sheets_data['Daily Summary'] = pd.DataFrame(daily_data)
-    
-    # Sheet 4: Weekly Summary
-    weekly_summary = {}
-    
-    for resp in responses:
-        # Get week start date (Monday)
-        date = resp.response_timestamp.date()
-        week_start = date - timedelta(days=date.weekday())
-        week_key = week_start
-        
-        if week_key not in weekly_summary:
-            weekly_summary[week_key] = {
-                'Week Starting': week_key,
-                'Total Responses': 0,
-                'Average DDS-2 Score': [],
-                'Average Legacy Severity': []
-            }
+        sheets_data['Daily Summary'] = _round_averages(daily_summary).reset_index()
         
-        weekly_summary[week_key]['Total Responses'] += 1
-        
-        if resp.question_type in ['dds2_q1_overwhelmed', 'dds2_q2_failing']:
-            weekly_summary[week_key]['Average DDS-2 Score'].append(int(resp.response_value))
-        elif resp.question_type == 'severity_rating':
-            weekly_summary[week_key]['Average Legacy Severity'].append(int(resp.response_value))
-    
-    weekly_data = []
-    for week_key, data in sorted(weekly_summary.items()):
-        avg_dds2_score = sum(data['Average DDS-2 Score']) / len(data['Average DDS-2 Score']) if data['Average DDS-2 Score'] else 0
-        avg_legacy_severity = sum(data['Average Legacy Severity']) / len(data['Average Legacy Severity']) if data['Average Legacy Severity'] else 0
-        weekly_data.append({
-            'Week Starting': data['Week Starting'],
-            'Total Responses': data['Total Responses'],
-            'Average DDS-2 Score (1-6)': round(avg_dds2_score, 2),
-            'Average Legacy Severity (1-5)': round(avg_legacy_severity, 2)
+        # Sheet 4: Weekly Summary
+        weekly_summary = responses_df.groupby('Week Starting').agg(**{
+            'Total Responses': ('question_type', 'size'),
+            'Average DDS-2 Score (1-6)': ('dds2_score', 'mean'),
+            'Average Legacy Severity (1-5)': ('legacy_score', 'mean')
         })
-    
-    if weekly_data:
-        sheets_data['Weekly Summary'] = pd.DataFrame(weekly_data)
+        sheets_data['Weekly Summary'] = _round_averages(weekly_summary).reset_index()
     
     # Sheet 5: DDS-2 Score Distribution
-    dds2_counts = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0, 6: 0}
-    legacy_severity_counts = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
+    dds2_counts = dict.fromkeys(DDS2_LEVEL_BY_VALUE.values(), 0)
+    legacy_severity_counts = dict.fromkeys(LEGACY_SEVERITY_LEVEL_BY_VALUE.values(), 0)
     
-    for resp in responses:
-        if resp.question_type in ['dds2_q1_overwhelmed', 'dds2_q2_failing']:
-            level = int(resp.response_value)
-            if 1 <= level <= 6:
-                dds2_counts[level] += 1
-        elif resp.question_type == 'severity_rating':
-            level = int(resp.response_value)
-            if 1 <= level <= 5:
-                legacy_severity_counts[level] += 1
+    # Let the database count each rating; at most a dozen rows come back
+    rating_counts = db.query(
+        Response.question_type, Response.response_value, func.count()
+    ).filter(
+        Response.user_id == patient_id,
+        Response.question_type.in_(DISTRIBUTION_QUESTION_TYPES)
+    ).group_by(Response.question_type, Response.response_value).all()
     
-    # DDS-2 Distribution with clinical descriptions
-    dds2_labels = [
-        "Not a problem", "A slight problem", "A moderate problem", 
-        "Somewhat serious problem", "A serious problem", "A very serious problem"
-    ]
+    for question_type, response_value, count in rating_counts:
+        if question_type == QuestionTypes.SEVERITY_RATING:
+            level = LEGACY_SEVERITY_LEVEL_BY_VALUE.get(response_value)
+            if level is not None:
+                legacy_severity_counts[level] += count
+        else:
+            level = DDS2_LEVEL_BY_VALUE.get(response_value)
+            if level is not None:
+                dds2_counts[level] += count
     
+    # DDS-2 Distribution with clinical descriptions
+    dds2_total = sum(dds2_counts.values())
     dds2_dist = pd.DataFrame([
-        {'DDS-2 Score': f'Level {k} - {dds2_labels[k-1]}', 
+        {'DDS-2 Score': f'Level {k} - {DDS2_LEVEL_LABELS[k-1]}', 
          'Count': v, 
-         'Percentage': round(v / sum(dds2_counts.values()) * 100, 1) if sum(dds2_counts.values()) > 0 else 0}
+         'Percentage': round(v / dds2_total * 100, 1) if dds2_total > 0 else 0}
         for k, v in dds2_counts.items()
     ])
     sheets_data['DDS-2 Score Distribution'] = dds2_dist
     
     # Legacy Severity Distribution (if any legacy data exists)
-    if sum(legacy_severity_counts.values()) > 0:
+    legacy_total = sum(legacy_severity_counts.values())
+    if legacy_total > 0:
         legacy_dist = pd.DataFrame([
-            {'Legacy Severity Level': f'Level {k} ({["Low", "Low-Medium", "Medium", "Medium-High", "High"][k-1]})', 
+            {'Legacy Severity Level': f'Level {k} ({LEGACY_SEVERITY_LABELS[k-1]})', 
              'Count': v, 
-             'Percentage': round(v / sum(legacy_severity_counts.values()) * 100, 1) if sum(legacy_severity_counts.values()) > 0 else 0}
+             'Percentage': round(v / legacy_total * 100, 1)}
             for k, v in legacy_severity_counts.items()
         ])
         sheets_data['Legacy Severity Distribution'] = legacy_dist
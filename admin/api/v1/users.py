@@ -23,6 +23,7 @@ from admin.schemas.users import (
 )
 from admin.services.users import UserService
 from admin.utils.audit import create_audit_log, AuditAction, EntityType
+from database.cache import invalidate_user_caches
 from database.database import get_db
 from database.models import User, UserStatus, Response, AssistantInteraction
 
@@ -228,6 +229,10 @@ async def update_patient(
             detail="Error updating patient"
         )
     
+    # The bot caches user rows and the active user list; drop them after a change
+    if changes:
+        await invalidate_user_caches(patient.telegram_id)
+    
     # Log the action
     await create_audit_log(
         db=db,
@@ -292,6 +297,9 @@ async def block_patient(
             detail="Error blocking patient"
         )
     
+    # The bot caches user rows and the active user list; drop them after a change
+    await invalidate_user_caches(patient.telegram_id)
+    
     # Log the action
     await create_audit_log(
         db=db,
@@ -356,6 +364,9 @@ async def unblock_patient(
             detail="Error unblocking patient"
         )
     
+    # The bot caches user rows and the active user list; drop them after a change
+    await invalidate_user_caches(patient.telegram_id)
+    
     # Log the action
     await create_audit_log(
         db=db,
@@ -33,6 +33,17 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # OAuth2 configuration
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+# Password strength patterns, compiled once at import
+UPPERCASE_RE = re.compile(r"[A-Z]")
+LOWERCASE_RE = re.compile(r"[a-z]")
+DIGIT_RE = re.compile(r"\d")
+SPECIAL_CHAR_RE = re.compile(r"[!@#$%^&*()_+\-=\[\]{};':\"\\|,.<>\/?]")
+COMMON_PASSWORD_PATTERNS = (
+    re.compile(r"(.)\1{2,}"),  # Repeated characters
+    re.compile(r"(012|123|234|345|456|567|678|789|890)"),  # Sequential numbers
+    re.compile(r"(abc|bcd|cde|def|efg|fgh|ghi|hij|ijk|jkl|klm|lmn|mno|nop|opq|pqr|qrs|rst|stu|tuv|uvw|vwx|wxy|xyz)"),  # Sequential letters
+)
+
 
 class TokenData(BaseModel):
     """Token data model for JWT payload."""
@@ -243,25 +254,25 @@ def validate_password_strength(password: str) -> Dict[str, Union[bool, str]]:
             "message": "Password must be at least 8 characters long"
         }
     
-    if not re.search(r"[A-Z]", password):
+    if not UPPERCASE_RE.search(password):
         return {
             "valid": False,
             "message": "Password must contain at least one uppercase letter"
         }
     
-    if not re.search(r"[a-z]", password):
+    if not LOWERCASE_RE.search(password):
         return {
             "valid": False,
             "message": "Password must contain at least one lowercase letter"
         }
     
-    if not re.search(r"\d", password):
+    if not DIGIT_RE.search(password):
         return {
             "valid": False,
             "message": "Password must contain at least one digit"
         }
     
-    if not re.search(r"[!@#$%^&*()_+\-=\[\]{};':\"\\|,.<>\/?]", password):
+    if not SPECIAL_CHAR_RE.search(password):
         return {
             "valid": False,
             "message": "Password must contain at least one special character"
@@ -290,26 +301,21 @@ def get_password_strength_score(password: str) -> int:
     score += length_score
     
     # Character variety score (max 40 points)
-    if re.search(r"[a-z]", password):
+    if LOWERCASE_RE.search(password):
         score += 10
-    if re.search(r"[A-Z]", password):
+    if UPPERCASE_RE.search(password):
         score += 10
-    if re.search(r"\d", password):
+    if DIGIT_RE.search(password):
         score += 10
-    if re.search(r"[!@#$%^&*()_+\-=\[\]{};':\"\\|,.<>\/?]", password):
+    if SPECIAL_CHAR_RE.search(password):
         score += 10
     
     # Pattern avoidance score (max 30 points)
     # Check for common patterns
-    common_patterns = [
-        r"(.)\1{2,}",  # Repeated characters
-        r"(012|123|234|345|456|567|678|789|890)",  # Sequential numbers
-        r"(abc|bcd|cde|def|efg|fgh|ghi|hij|ijk|jkl|klm|lmn|mno|nop|opq|pqr|qrs|rst|stu|tuv|uvw|vwx|wxy|xyz)",  # Sequential letters
-    ]
-    
+    lowered = password.lower()
     pattern_penalty = 0
-    for pattern in common_patterns:
-        if re.search(pattern, password.lower()):
+    for pattern in COMMON_PASSWORD_PATTERNS:
+        if pattern.search(lowered):
             pattern_penalty += 10
     
     score += max(30 - pattern_penalty, 0)
@@ -8,7 +8,7 @@ import logging
 import time
 
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from starlette.exceptions import HTTPException as StarletteHTTPException
@@ -16,7 +16,7 @@ import uvicorn
 from jose import JWTError, jwt
 
 from admin.api.v1 import router as api_v1_router
-from admin.core.config import settings
+from admin.core.config import settings, SECRET_KEY, ALGORITHM
 from admin.i18n.jinja2 import create_template_context, setup_i18n_jinja2
 from admin.i18n.middleware import I18nMiddleware
 from database.database import SQLALCHEMY_DATABASE_URL
@@ -133,8 +133,6 @@ async def check_auth_cookie(request: Request):
         return None
         
     try:
-        # Import here to avoid circular imports
-        from admin.core.config import SECRET_KEY, ALGORITHM
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         return payload
     except JWTError:
@@ -279,8 +277,6 @@ async def logs_page(request: Request):
 @app.get("/i18n/{language}.json")
 async def get_i18n_file(language: str):
     """Serve i18n JSON files."""
-    from fastapi.responses import FileResponse
-    
     file_path = Path(__file__).parent / "static" / "i18n" / f"{language}.json"
     if file_path.exists():
         return FileResponse(file_path, media_type="application/json")
@@ -34,6 +34,8 @@ class RequestValidator:
     MAX_JSON_SIZE = 1024 * 1024  # 1MB
     MAX_FORM_SIZE = 10 * 1024 * 1024  # 10MB
     MAX_FILE_SIZE = settings.MAX_UPLOAD_SIZE  # From config
+    MAX_STRING_LENGTH = 10000  # Longest string kept by sanitize_string
+    MAX_CONTENT_LENGTH_DIGITS = 18  # Longer headers cannot be a real request size
     
     # Patterns that might indicate SQL injection
     SQL_PATTERNS = [
@@ -48,6 +50,11 @@ class RequestValidator:
     # Compile patterns for efficiency
     SQL_REGEX = [re.compile(pattern, re.IGNORECASE) for pattern in SQL_PATTERNS]
     
+    # Every SQL pattern needs at least one of these (lowercase) substrings to match
+    SQL_TRIGGER_TOKENS = (
+        ';', '\\', '<script', 'union', 'select', 'drop', 'delete', 'insert', 'update', 'exec'
+    )
+    
     # XSS patterns
     XSS_PATTERNS = [
         r"<script[^>]*>.*?</script>",
@@ -60,6 +67,9 @@ class RequestValidator:
     
     XSS_REGEX = [re.compile(pattern, re.IGNORECASE) for pattern in XSS_PATTERNS]
     
+    # Every XSS pattern needs at least one of these characters to match
+    XSS_TRIGGER_CHARS = ('<', ':', '=')
+    
     @classmethod
     def validate_content_length(cls, request: Request) -> None:
         """Check if content length is within limits"""
@@ -68,10 +78,15 @@ class RequestValidator:
         if not content_length:
             return
         
-        try:
-            size = int(content_length)
-        except ValueError:
+        # Content-Length is plain ASCII digits; checking that up front avoids the
+        # int() exception path (and huge-number parsing) on hostile headers
+        if (
+            len(content_length) > cls.MAX_CONTENT_LENGTH_DIGITS
+            or not content_length.isascii()
+            or not content_length.isdigit()
+        ):
             raise ValidationError("Invalid content-length header")
+        size = int(content_length)
         
         content_type = request.headers.get("content-type", "").lower()
         
@@ -93,6 +108,14 @@ class RequestValidator:
         if not isinstance(value, str):
             return False
         
+        # Plain ASCII text without any trigger token cannot match, so skip the
+        # regex engine. Non-ASCII input always gets the full scan because
+        # IGNORECASE also folds characters such as the dotless i.
+        if value.isascii():
+            lowered = value.lower()
+            if not any(token in lowered for token in cls.SQL_TRIGGER_TOKENS):
+                return False
+        
         # Check against SQL patterns
         for pattern in cls.SQL_REGEX:
             if pattern.search(value):
@@ -106,6 +129,10 @@ class RequestValidator:
         if not isinstance(value, str):
             return False
         
+        # Plain text (the common case) cannot match, so skip the regex engine
+        if not any(char in value for char in cls.XSS_TRIGGER_CHARS):
+            return False
+        
         # Check against XSS patterns
         for pattern in cls.XSS_REGEX:
             if pattern.search(value):
@@ -143,17 +170,15 @@ class RequestValidator:
         if not isinstance(value, str):
             return value
         
+        # Limit length first so the passes below never scan oversized input
+        value = value[:cls.MAX_STRING_LENGTH]
+        
         # Remove null bytes
         value = value.replace("\x00", "")
         
         # Trim whitespace
         value = value.strip()
         
-        # Limit length to prevent DoS
-        max_length = 10000
-        if len(value) > max_length:
-            value = value[:max_length]
-        
         return value
     
     @classmethod
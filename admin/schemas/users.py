@@ -7,6 +7,9 @@ from typing import Optional, List, Any
 
 from pydantic import BaseModel, Field, EmailStr, validator
 
+# Separators allowed in phone numbers, removed in one pass before the digit check
+PHONE_SEPARATORS = str.maketrans('', '', '+- ')
+
 class UserBase(BaseModel):
     """Base patient schema."""
     first_name: str
@@ -18,7 +21,7 @@ class UserBase(BaseModel):
 class UserResponse(UserBase):
     """Patient response schema for list views."""
     id: int
-    telegram_id: str
+    telegram_id: int
     status: str
     registration_date: datetime
     last_interaction: Optional[datetime] = None
@@ -44,8 +47,11 @@ class UserUpdate(BaseModel):
     
     @validator('phone_number')
     def validate_phone(cls, v):
-        if v and not v.replace('+', '').replace('-', '').replace(' ', '').isdigit():
-            raise ValueError('Phone number must contain only digits, +, - and spaces')
+        if v:
+            digits = v.translate(PHONE_SEPARATORS)
+            # isascii() rejects non-ASCII Unicode digits that isdigit() accepts
+            if not (digits.isascii() and digits.isdigit()):
+                raise ValueError('Phone number must contain only digits, +, - and spaces')
         return v
 
 
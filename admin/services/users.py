@@ -6,19 +6,20 @@ from datetime import datetime
 from typing import Optional, Dict, Any, List, Tuple
 import re
 
-from sqlalchemy import or_, func
+from sqlalchemy import String, cast, or_, func
 from sqlalchemy.orm import Session
 
 from database.models import User, UserStatus, Response
 
+EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
 class UserService:
     """Service class for patient-related operations."""
     
     @staticmethod
     def validate_email(email: str) -> bool:
         """Validate email format."""
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, email))
+        return bool(EMAIL_RE.match(email))
     
     @staticmethod
     def get_patients_with_filters(
@@ -47,7 +48,7 @@ class UserService:
                     User.first_name.ilike(search_pattern),
                     User.family_name.ilike(search_pattern),
                     User.email.ilike(search_pattern),
-                    User.telegram_id.ilike(search_pattern)
+                    cast(User.telegram_id, String).ilike(search_pattern)
                 )
             )
         
@@ -0,0 +1,37 @@
+"""convert users.telegram_id to BIGINT
+
+Revision ID: a3f9c2d4e8b1
+Revises: 35e61d65ed37
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f9c2d4e8b1'
+down_revision: Union[str, Sequence[str], None] = '35e61d65ed37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Telegram IDs are numeric; storing them as BIGINT narrows the unique index
+    # and removes str/int conversions in the bot. Existing values are all digits,
+    # so MySQL converts them in place.
+    op.alter_column('users', 'telegram_id',
+                    existing_type=sa.String(50),
+                    type_=sa.BigInteger(),
+                    existing_nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('users', 'telegram_id',
+                    existing_type=sa.BigInteger(),
+                    type_=sa.String(50),
+                    existing_nullable=False)
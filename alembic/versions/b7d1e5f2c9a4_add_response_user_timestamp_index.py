@@ -0,0 +1,34 @@
+"""add composite index for per-user response range queries
+
+Revision ID: b7d1e5f2c9a4
+Revises: a3f9c2d4e8b1
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d1e5f2c9a4'
+down_revision: Union[str, Sequence[str], None] = 'a3f9c2d4e8b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Exports read one user's responses in a timestamp range, ordered by
+    # timestamp; question_type is included so those reads are index-only
+    # apart from the response value
+    op.create_index(
+        'ix_responses_user_timestamp_type',
+        'responses',
+        ['user_id', 'response_timestamp', 'question_type']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_responses_user_timestamp_type', table_name='responses')
@@ -0,0 +1,34 @@
+"""add composite index for per-user, per-question response reads
+
+Revision ID: d4c8a1e6f3b2
+Revises: b7d1e5f2c9a4
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4c8a1e6f3b2'
+down_revision: Union[str, Sequence[str], None] = 'b7d1e5f2c9a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Admin response lists filtered by question type seek on
+    # (user_id, question_type) and read the newest rows straight off the
+    # index; the patient report rating counts use the same prefix
+    op.create_index(
+        'ix_responses_user_type_timestamp',
+        'responses',
+        ['user_id', 'question_type', 'response_timestamp']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_responses_user_type_timestamp', table_name='responses')
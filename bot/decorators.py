@@ -1,17 +1,21 @@
 """Decorators for the diabetes monitoring bot."""
+import asyncio
 import functools
 import logging
+from collections import OrderedDict, deque
 from datetime import datetime
 from time import time
-from typing import Callable, Optional, TypeVar, ParamSpec
+from typing import Callable, Deque, Dict, Optional, TypeVar, ParamSpec
+
+from sqlalchemy import update as sql_update
 
 from telegram import Update
 from telegram.ext import ContextTypes
 
-from bot_config.bot_constants import BotMessages
+from bot_config.bot_constants import BotMessages, BotSettings
 from bot_config.languages import Languages
 from config import ADMIN_TELEGRAM_IDS, IS_DEVELOPMENT
-from database import get_user_by_telegram_id, db_session_context
+from database import get_cached_user_by_telegram_id, db_session_context
 from database.models import User
 
 # Type definitions
@@ -20,17 +24,25 @@ T = TypeVar('T')
 
 logger = logging.getLogger(__name__)
 
+# Pending last_interaction timestamps keyed by user ID, written in batches
+_pending_interactions: Dict[int, datetime] = {}
+_interaction_flusher: Optional[asyncio.Task] = None
+_interaction_flusher_stop: Optional[asyncio.Event] = None
+
 
 def with_user_context(func: Callable) -> Callable:
     """Decorator that provides user context without requiring registration."""
     @functools.wraps(func)
     async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
-        telegram_id = str(update.effective_user.id)
+        telegram_user = update.effective_user
+        if not telegram_user:
+            return None
+        telegram_id = telegram_user.id
         
-        with db_session_context(commit=False) as db:
-            user = get_user_by_telegram_id(db, telegram_id)
+        async with db_session_context(commit=False) as db:
+            db_user = await get_cached_user_by_telegram_id(db, telegram_id)
             # Pass user (can be None) to the wrapped function
-            return await func(update, context, user, *args, **kwargs)
+            return await func(update, context, db_user, *args, **kwargs)
     
     return wrapper
 
@@ -39,12 +51,15 @@ def require_registered_user(func: Callable) -> Callable:
     """Decorator to ensure user is registered before accessing a command."""
     @functools.wraps(func)
     async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
-        telegram_id = str(update.effective_user.id)
+        telegram_user = update.effective_user
+        if not telegram_user:
+            return None
+        telegram_id = telegram_user.id
         
-        with db_session_context(commit=False) as db:
-            user = get_user_by_telegram_id(db, telegram_id)
+        async with db_session_context(commit=False) as db:
+            db_user = await get_cached_user_by_telegram_id(db, telegram_id)
             
-            if not user:
+            if not db_user:
                 # Import here to avoid circular imports
                 from bot.handlers.language import get_user_language, get_message
                 lang = get_user_language(context, None)
@@ -53,25 +68,30 @@ def require_registered_user(func: Callable) -> Callable:
                 return
             
             # Pass user to the wrapped function
-            return await func(update, context, user, *args, **kwargs)
+            return await func(update, context, db_user, *args, **kwargs)
     
     return wrapper
 
 
 def admin_only(telegram_ids: Optional[list] = None):
     """Decorator to restrict access to admin users only."""
+    # Admin IDs come from configuration as strings; parse them once here
+    allowed_ids = frozenset(
+        int(telegram_id) for telegram_id in (telegram_ids or ADMIN_TELEGRAM_IDS)
+        if str(telegram_id).strip().isdigit()
+    )
+    
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
-            user_id = str(update.effective_user.id)
-            allowed_ids = telegram_ids or ADMIN_TELEGRAM_IDS
+            user_id = update.effective_user.id
             
             if user_id not in allowed_ids:
                 # Import here to avoid circular imports
                 from bot.handlers.language import get_user_language, get_message
                 # Try to get user for language preference
-                with db_session_context(commit=False) as db:
-                    user = get_user_by_telegram_id(db, user_id)
+                async with db_session_context(commit=False) as db:
+                    user = await get_cached_user_by_telegram_id(db, user_id)
                 lang = get_user_language(context, user)
                 message = get_message('ADMIN_ONLY_ACCESS', lang)
                 await update.message.reply_text(message)
@@ -83,37 +103,113 @@ def admin_only(telegram_ids: Optional[list] = None):
 
 
 def update_last_interaction(func: Callable) -> Callable:
-    """Decorator to update user's last interaction timestamp."""
+    """Decorator to update user's last interaction timestamp.
+    
+    The timestamp is only queued here; the interaction flusher writes all
+    pending timestamps to the database in a single batch.
+    """
     @functools.wraps(func)
     async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE, user: User, *args, **kwargs):
-        # Update last interaction
-        with db_session_context() as db:
-            db_user = db.query(User).filter(User.id == user.id).first()
-            if db_user:
-                db_user.last_interaction = datetime.utcnow()
+        _pending_interactions[user.id] = datetime.utcnow()
         
         return await func(update, context, user, *args, **kwargs)
     
     return wrapper
 
 
+async def flush_pending_interactions() -> int:
+    """Write all queued last_interaction timestamps in one batched UPDATE.
+    
+    Returns:
+        Number of users whose timestamp was written
+    """
+    if not _pending_interactions:
+        return 0
+    
+    pending = dict(_pending_interactions)
+    _pending_interactions.clear()
+    
+    try:
+        async with db_session_context() as db:
+            await db.execute(
+                sql_update(User),
+                [
+                    {'id': user_id, 'last_interaction': timestamp}
+                    for user_id, timestamp in pending.items()
+                ]
+            )
+    except Exception as e:
+        logger.error(f"Failed to flush last interaction updates: {e}")
+        # Re-queue without overwriting newer timestamps recorded meanwhile
+        for user_id, timestamp in pending.items():
+            _pending_interactions.setdefault(user_id, timestamp)
+        return 0
+    
+    return len(pending)
+
+
+async def _run_interaction_flusher(interval_seconds: float, stop: asyncio.Event) -> None:
+    """Periodically flush queued last_interaction timestamps until stop is set.
+    
+    The task is stopped through the event rather than cancelled, so timestamps
+    already taken out of the pending dict are always written or re-queued.
+    """
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval_seconds)
+        except asyncio.TimeoutError:
+            await flush_pending_interactions()
+
+
+def start_interaction_flusher(
+    interval_seconds: float = BotSettings.INTERACTION_FLUSH_INTERVAL_SECONDS
+) -> None:
+    """Start the background task that batches last_interaction writes."""
+    global _interaction_flusher, _interaction_flusher_stop
+    if _interaction_flusher is None or _interaction_flusher.done():
+        _interaction_flusher_stop = asyncio.Event()
+        _interaction_flusher = asyncio.create_task(
+            _run_interaction_flusher(interval_seconds, _interaction_flusher_stop)
+        )
+
+
+async def stop_interaction_flusher() -> None:
+    """Stop the background flusher and write any remaining timestamps."""
+    global _interaction_flusher, _interaction_flusher_stop
+    if _interaction_flusher is not None:
+        # Let an in-progress flush finish instead of cancelling it mid-write
+        _interaction_flusher_stop.set()
+        await _interaction_flusher
+        _interaction_flusher = None
+        _interaction_flusher_stop = None
+    await flush_pending_interactions()
+
+
 def log_command_usage(func: Callable) -> Callable:
     """Decorator to log command usage."""
     @functools.wraps(func)
     async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
-        user = update.effective_user
-        command = update.message.text if update.message else "Unknown"
-        
-        logger.info(f"Command '{command}' used by user {user.id} ({user.username or 'No username'})")
+        # Only build the log record when INFO is actually enabled
+        if logger.isEnabledFor(logging.INFO):
+            user = update.effective_user
+            command = update.message.text if update.message else "Unknown"
+            logger.info(
+                "Command '%s' used by user %s (%s)",
+                command, user.id, user.username or 'No username'
+            )
         
         return await func(update, context, *args, **kwargs)
     
     return wrapper
 
 
-def rate_limit(max_calls: int = 5, period_seconds: int = 60):
-    """Rate limiting decorator to prevent spam."""
-    user_calls = {}
+def rate_limit(max_calls: int = 5, period_seconds: int = 60, max_tracked_users: int = BotSettings.RATE_LIMIT_MAX_TRACKED_USERS):
+    """Rate limiting decorator to prevent spam.
+    
+    Call history is kept in a size-bounded LRU so users who stop talking to
+    the bot are eventually evicted instead of being tracked forever.
+    """
+    user_calls: OrderedDict[int, Deque[float]] = OrderedDict()
     
     def decorator(func: Callable[P, T]) -> Callable[P, T]:
         @functools.wraps(func)
@@ -122,35 +218,39 @@ def rate_limit(max_calls: int = 5, period_seconds: int = 60):
             if IS_DEVELOPMENT:
                 return await func(update, context, *args, **kwargs)
             
-            user_id = str(update.effective_user.id)
+            user_id = update.effective_user.id
             current_time = time()
             
-            # Initialize or clean old calls
-            if user_id not in user_calls:
-                user_calls[user_id] = []
+            # Look up (or create) the user's call history and mark it most recent
+            calls = user_calls.get(user_id)
+            if calls is None:
+                calls = deque(maxlen=max_calls)
+                user_calls[user_id] = calls
+                if len(user_calls) > max_tracked_users:
+                    user_calls.popitem(last=False)
+            else:
+                user_calls.move_to_end(user_id)
             
             # Remove old calls outside the time window
-            user_calls[user_id] = [
-                call_time for call_time in user_calls[user_id]
-                if current_time - call_time < period_seconds
-            ]
+            while calls and current_time - calls[0] >= period_seconds:
+                calls.popleft()
             
             # Check rate limit
-            if len(user_calls[user_id]) >= max_calls:
+            if len(calls) >= max_calls:
                 # Import here to avoid circular imports
                 from bot.handlers.language import get_user_language, get_message
                 # Try to get user for language preference
-                with db_session_context(commit=False) as db:
-                    user = get_user_by_telegram_id(db, user_id)
+                async with db_session_context(commit=False) as db:
+                    user = await get_cached_user_by_telegram_id(db, user_id)
                 lang = get_user_language(context, user)
                 message = get_message('RATE_LIMIT_EXCEEDED', lang)
                 await update.message.reply_text(message)
                 return
             
             # Record this call
-            user_calls[user_id].append(current_time)
+            calls.append(current_time)
             
             return await func(update, context, *args, **kwargs)
         
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
@@ -7,7 +7,7 @@ Handles:
 from typing import Optional
 import logging
 
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram import Update
 from telegram.ext import ContextTypes
 
 from bot.decorators import (
@@ -16,13 +16,15 @@ from bot.decorators import (
     update_last_interaction
 )
 from bot.utils.error_handling import handle_all_errors
-from bot.handlers.language import get_user_language, get_message
+from bot.handlers.language import (
+    get_user_language, get_message, INITIAL_LANGUAGE_KEYBOARDS
+)
 from bot_config.bot_constants import LogMessages
 from bot_config.languages import Languages
 from database import (
     db_session_context,
-    get_user_by_telegram_id,
-    create_user
+    create_user,
+    invalidate_user_caches
 )
 from database.constants import DefaultValues
 from database.models import User
@@ -84,23 +86,10 @@ async def start(
         context.user_data['detected_language'] = detected_lang
         context.user_data['language'] = detected_lang
         
-        # Create language selection buttons
-        keyboard = []
-        for lang_code in Languages.SUPPORTED:
-            flag = Languages.FLAGS[lang_code]
-            name = Languages.NAMES[lang_code]
-            # Mark detected language
-            if lang_code == detected_lang:
-                button_text = f"✓ {flag} {name}"
-            else:
-                button_text = f"{flag} {name}"
-            
-            keyboard.append([InlineKeyboardButton(
-                button_text,
-                callback_data=f"initial_language_{lang_code}"
-            )])
-        
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        # Language selection buttons with the detected language marked
+        reply_markup = INITIAL_LANGUAGE_KEYBOARDS.get(
+            detected_lang, INITIAL_LANGUAGE_KEYBOARDS[Languages.ENGLISH]
+        )
         
         # Send welcome message with language selection
         welcome_text = get_message('WELCOME_NEW', detected_lang, first_name=telegram_user.first_name)
@@ -128,7 +117,7 @@ async def register(
         user: User object if already registered, None otherwise
     """
     telegram_user = update.effective_user
-    telegram_id = str(telegram_user.id)
+    telegram_id = telegram_user.id
     
     # Get user's language preference
     lang = get_user_language(context, user)
@@ -142,8 +131,8 @@ async def register(
     
     # Register new user
     try:
-        with db_session_context() as db:
-            user = create_user(
+        async with db_session_context() as db:
+            new_user = await create_user(
                 db=db,
                 first_name=telegram_user.first_name or DefaultValues.DEFAULT_NAME,
                 family_name=telegram_user.last_name or DefaultValues.DEFAULT_FAMILY_NAME,
@@ -155,12 +144,13 @@ async def register(
             
             # Update user's language preference if set in context
             if 'language' in context.user_data and context.user_data['language'] != Languages.ENGLISH:
-                user.language = context.user_data['language']
-                db.commit()
+                new_user.language = context.user_data['language']
+                await db.commit()
             
             await update.message.reply_text(
-                get_message('REGISTRATION_SUCCESS', lang, first_name=user.first_name)
+                get_message('REGISTRATION_SUCCESS', lang, first_name=new_user.first_name)
             )
+        await invalidate_user_caches(telegram_id)
     except Exception as e:
         logger.error(f"Registration error for user {telegram_id}: {str(e)}")
         await update.message.reply_text(
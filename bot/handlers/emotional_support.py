@@ -15,6 +15,7 @@ from bot.decorators import (
 )
 from bot.llm_service import get_llm_service
 from bot_config.bot_constants import BotMessages
+from bot_config.languages import Languages
 from bot_config.llm_constants import (
     ConversationStates, SupportMessages, LLMSettings
 )
@@ -22,7 +23,7 @@ from bot.handlers.language import get_user_language, get_message
 from database import (
     db_session_context,
     create_assistant_interaction,
-    get_user_by_telegram_id
+    get_cached_user_by_telegram_id
 )
 from database.models import User
 
@@ -76,9 +77,9 @@ async def handle_support_message(update: Update, context: ContextTypes.DEFAULT_T
     support_context = context.user_data.get('support_context', {})
     
     # Get user from database
-    telegram_id = str(update.effective_user.id)
-    with db_session_context(commit=False) as db:
-        user = get_user_by_telegram_id(db, telegram_id)
+    telegram_id = update.effective_user.id
+    async with db_session_context(commit=False) as db:
+        user = await get_cached_user_by_telegram_id(db, telegram_id)
         if not user:
             await update.message.reply_text(BotMessages.NOT_REGISTERED)
             return ConversationHandler.END
@@ -95,7 +96,6 @@ async def handle_support_message(update: Update, context: ContextTypes.DEFAULT_T
         user_name = user.first_name if user else "there"
         
         # Get language preference
-        from bot_config.languages import Languages
         lang_code = context.user_data.get('language', 'en')
         language_name = Languages.NAMES.get(lang_code, 'English')
         
@@ -133,8 +133,8 @@ async def handle_support_message(update: Update, context: ContextTypes.DEFAULT_T
         })
         
         # Save to database
-        with db_session_context() as db:
-            create_assistant_interaction(
+        async with db_session_context() as db:
+            await create_assistant_interaction(
                 db=db,
                 user_id=support_context['user_id'],
                 prompt=user_message,
@@ -235,9 +235,9 @@ async def command_during_support(update: Update, context: ContextTypes.DEFAULT_T
 async def offer_support_after_dds2(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Offer support after high DDS-2 score"""
     # Get user for language preference
-    telegram_id = str(update.effective_user.id)
-    with db_session_context(commit=False) as db:
-        user = get_user_by_telegram_id(db, telegram_id)
+    telegram_id = update.effective_user.id
+    async with db_session_context(commit=False) as db:
+        user = await get_cached_user_by_telegram_id(db, telegram_id)
     
     lang = get_user_language(context, user)
     
@@ -311,9 +311,9 @@ async def support_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     
     if query.data == "start_support":
         # Get user
-        telegram_id = str(query.from_user.id)
-        with db_session_context(commit=False) as db:
-            user = get_user_by_telegram_id(db, telegram_id)
+        telegram_id = query.from_user.id
+        async with db_session_context(commit=False) as db:
+            user = await get_cached_user_by_telegram_id(db, telegram_id)
             if user:
                 # Get user's latest DDS-2 score from context or database
                 default_score = (LLMSettings.MIN_DDS2_SCORE + LLMSettings.MAX_DDS2_SCORE) // 2
@@ -354,9 +354,9 @@ async def support_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     
     elif query.data == "decline_support":
         # Get user for language preference
-        telegram_id = str(query.from_user.id)
-        with db_session_context(commit=False) as db:
-            user = get_user_by_telegram_id(db, telegram_id)
+        telegram_id = query.from_user.id
+        async with db_session_context(commit=False) as db:
+            user = await get_cached_user_by_telegram_id(db, telegram_id)
         lang = get_user_language(context, user)
         
         await query.edit_message_text(get_message('SUPPORT_DECLINED', lang))
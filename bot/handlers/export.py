@@ -4,12 +4,18 @@ Handles:
 - /export command
 - Helper functions for data export
 """
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
+from io import BytesIO
+from typing import Dict
+import asyncio
 import logging
+import multiprocessing
 import os
-import shutil
+import tempfile
 
-from telegram import Update
+from telegram import InputFile, Update
 from telegram.ext import ContextTypes
 
 from bot.decorators import (
@@ -23,55 +29,99 @@ from bot_config.bot_constants import (
     BotMessages, ExportSettings, LogMessages
 )
 from bot_config.languages import Messages
-from database import db_session_context
-from database.models import User, Response
+from database import db_session_context, get_user_response_records
+from database.models import User
 from scripts.data_export_dds2 import DDS2DataExporter
 
 logger = logging.getLogger(__name__)
 
 
-def cleanup_export_directory(export_dir: str) -> None:
-    """Clean up temporary export directory"""
-    try:
-        if os.path.exists(export_dir):
-            shutil.rmtree(export_dir)
-            logger.info(f"Cleaned up export directory: {export_dir}")
-    except Exception as e:
-        logger.error(f"Failed to cleanup export directory {export_dir}: {e}")
+def _create_graph_pool() -> ProcessPoolExecutor:
+    """Create the process pool that renders export graphs.
+    
+    Workers are spawned rather than forked: forking the multi-threaded bot
+    process (event loop plus I/O threads) can deadlock the children.
+    """
+    return ProcessPoolExecutor(
+        max_workers=ExportSettings.GRAPH_PROCESS_WORKERS,
+        mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+# Export work runs off the event loop. Graphs use processes because rendering
+# is CPU-bound and would hold the GIL; XML and file system work use threads.
+_graph_pool = _create_graph_pool()
+_io_pool = ThreadPoolExecutor(max_workers=ExportSettings.IO_THREAD_WORKERS)
+
+# Caption message key for each generated graph file
+GRAPH_CAPTION_KEYS = {
+    'dds2_timeline.png': 'GRAPH_CAPTION_DDS2_SCORES',
+    'dds2_distribution.png': 'GRAPH_CAPTION_DISTRESS_DISTRIBUTION',
+    'dds2_questions.png': 'GRAPH_CAPTION_DDS2_SCORES',  # Using same key as timeline
+    'distress_timeline.png': 'GRAPH_CAPTION_DDS2_SCORES',
+    'severity_distribution.png': 'GRAPH_CAPTION_DISTRESS_DISTRIBUTION',
+    'response_rate.png': 'GRAPH_CAPTION_RESPONSE_RATE',
+    'severity_trend.png': 'GRAPH_CAPTION_DDS2_SCORES'
+}
+
+
+def prepare_export_directory(telegram_id: int) -> tempfile.TemporaryDirectory:
+    """Create temporary directory for export files.
+    
+    The directory is removed by its cleanup() method, or by the finalizer if
+    an export fails before cleanup runs.
+    """
+    return tempfile.TemporaryDirectory(
+        prefix=f"{ExportSettings.EXPORT_DIR_PREFIX}{telegram_id}_",
+        ignore_cleanup_errors=True
+    )
 
 
-def prepare_export_directory(telegram_id: str) -> str:
-    """Create temporary directory for export files"""
-    export_dir = os.path.join(ExportSettings.EXPORT_DIR_PREFIX, f"export_{telegram_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
-    os.makedirs(export_dir, exist_ok=True)
-    return export_dir
+async def _generate_graphs(exporter: DDS2DataExporter, *args) -> None:
+    """Render the export graphs in the graph process pool.
+    
+    A pool whose worker died is broken for good, so it is replaced before the
+    error propagates and the next export can render graphs again.
+    """
+    global _graph_pool
+    pool = _graph_pool
+    try:
+        await asyncio.get_running_loop().run_in_executor(pool, exporter.generate_graphs, *args)
+    except BrokenProcessPool:
+        if _graph_pool is pool:
+            logger.warning("Graph process pool broke; starting a new one")
+            _graph_pool = _create_graph_pool()
+            pool.shutdown(wait=False)
+        raise
 
 
-def generate_export_files(db, user: User, start_date: datetime, end_date: datetime, export_dir: str) -> dict:
+async def generate_export_files(db, user: User, start_date: datetime, end_date: datetime, export_dir: str) -> dict:
     """Generate XML and graph files for export"""
-    # Get user's responses
-    responses = db.query(Response).filter(
-        Response.user_id == user.id,
-        Response.response_timestamp >= start_date,
-        Response.response_timestamp <= end_date
-    ).order_by(Response.response_timestamp).all()
+    # Fetch responses once as compact tuples shared by the XML and graph workers
+    responses = await get_user_response_records(db, user.id, start_date, end_date)
     
     if not responses:
         raise ValueError("No data to export")
     
     # Create exporter and generate files
     exporter = DDS2DataExporter()
+    loop = asyncio.get_running_loop()
     
-    # Generate XML
-    xml_file = exporter.export_user_data(user, responses, start_date, end_date, export_dir)
+    # XML and graphs are independent, so write them concurrently
+    xml_task = loop.run_in_executor(
+        _io_pool, exporter.export_user_data, user, responses, start_date, end_date, export_dir
+    )
+    graphs_task = _generate_graphs(exporter, responses, user, start_date, end_date, export_dir)
+    xml_result, graphs_result = await asyncio.gather(xml_task, graphs_task, return_exceptions=True)
     
-    # Generate graphs
-    graphs_generated = False
-    try:
-        exporter.generate_graphs(responses, user, start_date, end_date, export_dir)
-        graphs_generated = True
-    except Exception as e:
-        logger.warning(f"Could not generate graphs: {e}")
+    # A failed XML export fails the whole export; graphs are optional
+    if isinstance(xml_result, BaseException):
+        raise xml_result
+    xml_file = xml_result
+    
+    graphs_generated = not isinstance(graphs_result, BaseException)
+    if not graphs_generated:
+        logger.warning(f"Could not generate graphs: {graphs_result}")
     
     # Calculate stats
     stats = {
@@ -87,53 +137,60 @@ def generate_export_files(db, user: User, start_date: datetime, end_date: dateti
     }
 
 
+def _read_export_files(export_dir: str, include_graphs: bool) -> Dict[str, bytes]:
+    """Read the generated XML (and optionally graph) files into memory.
+    
+    Args:
+        export_dir: Directory containing the generated files
+        include_graphs: Whether to read the PNG graphs as well
+        
+    Returns:
+        Dict mapping file name to file contents, XML first then sorted graphs
+    """
+    names = sorted(os.listdir(export_dir))
+    xml_files = [f for f in names if f.endswith('.xml')][:1]
+    image_files = [f for f in names if f.endswith('.png')] if include_graphs else []
+    
+    files = {}
+    for name in xml_files + image_files:
+        with open(os.path.join(export_dir, name), 'rb') as f:
+            files[name] = f.read()
+    return files
+
+
+def _graph_caption(img_file: str, user_lang: str) -> str:
+    """Get the translated caption for a generated graph file."""
+    caption_key = GRAPH_CAPTION_KEYS.get(img_file)
+    if caption_key:
+        return get_message(caption_key, user_lang)
+    # Fallback for unknown graph types
+    return f"📊 {img_file.replace('_', ' ').replace('.png', '').title()}"
+
+
 async def send_export_files_to_user(update: Update, context: ContextTypes.DEFAULT_TYPE, export_dir: str, stats: dict, graphs_generated: bool, user: User):
-    """Send generated export files to user via Telegram"""
+    """Send generated export files to user via Telegram.
+    
+    Files are read off the event loop in one pass, then uploaded one at a
+    time so they arrive in order: the XML first, then the graphs sorted by name.
+    """
     # Get user language
     user_lang = get_user_language(context, user)
     
-    # Send XML file
-    xml_files = [f for f in os.listdir(export_dir) if f.endswith('.xml')]
-    if xml_files:
-        xml_path = os.path.join(export_dir, xml_files[0])
-        with open(xml_path, 'rb') as f:
-            # Use translated caption
-            xml_caption = get_message('EXPORT_XML_CAPTION', user_lang)
+    files = await asyncio.get_running_loop().run_in_executor(
+        _io_pool, _read_export_files, export_dir, graphs_generated
+    )
+    
+    for name, data in files.items():
+        if name.endswith('.xml'):
             await update.message.reply_document(
-                document=f,
-                filename=xml_files[0],
-                caption=xml_caption
+                document=InputFile(BytesIO(data), filename=name),
+                caption=get_message('EXPORT_XML_CAPTION', user_lang)
+            )
+        else:
+            await update.message.reply_photo(
+                photo=InputFile(BytesIO(data), filename=name),
+                caption=_graph_caption(name, user_lang)
             )
-    
-    # Send graph images if generated
-    if graphs_generated:
-        image_files = sorted([f for f in os.listdir(export_dir) if f.endswith('.png')])
-        for img_file in image_files:
-            img_path = os.path.join(export_dir, img_file)
-            with open(img_path, 'rb') as f:
-                # Map file names to translation keys
-                caption_map = {
-                    'dds2_timeline.png': 'GRAPH_CAPTION_DDS2_SCORES',
-                    'dds2_distribution.png': 'GRAPH_CAPTION_DISTRESS_DISTRIBUTION',
-                    'dds2_questions.png': 'GRAPH_CAPTION_DDS2_SCORES',  # Using same key as timeline
-                    'distress_timeline.png': 'GRAPH_CAPTION_DDS2_SCORES',
-                    'severity_distribution.png': 'GRAPH_CAPTION_DISTRESS_DISTRIBUTION',
-                    'response_rate.png': 'GRAPH_CAPTION_RESPONSE_RATE',
-                    'severity_trend.png': 'GRAPH_CAPTION_DDS2_SCORES'
-                }
-                
-                # Get translated caption or use default
-                caption_key = caption_map.get(img_file)
-                if caption_key:
-                    caption = get_message(caption_key, user_lang)
-                else:
-                    # Fallback for unknown graph types
-                    caption = f"📊 {img_file.replace('_', ' ').replace('.png', '').title()}"
-                
-                await update.message.reply_photo(
-                    photo=f,
-                    caption=caption
-                )
 
 
 @require_registered_user
@@ -143,7 +200,7 @@ async def send_export_files_to_user(update: Update, context: ContextTypes.DEFAUL
 async def export_data(update: Update, context: ContextTypes.DEFAULT_TYPE, user: User) -> None:
     """Export user data and send files via Telegram - orchestrator function"""
     telegram_id = user.telegram_id
-    export_dir = None
+    temp_dir = None
     
     # Get user language
     user_lang = get_user_language(context, user)
@@ -158,11 +215,14 @@ async def export_data(update: Update, context: ContextTypes.DEFAULT_TYPE, user:
     
     try:
         # Step 1: Prepare export directory
-        export_dir = prepare_export_directory(telegram_id)
+        temp_dir = await asyncio.get_running_loop().run_in_executor(
+            _io_pool, prepare_export_directory, telegram_id
+        )
+        export_dir = temp_dir.name
         
         # Step 2: Generate export files (XML and graphs)
-        with db_session_context(commit=False) as db:
-            export_results = generate_export_files(
+        async with db_session_context(commit=False) as db:
+            export_results = await generate_export_files(
                 db=db,
                 user=user,
                 start_date=start_date,
@@ -198,5 +258,5 @@ async def export_data(update: Update, context: ContextTypes.DEFAULT_TYPE, user:
         await update.message.reply_text(error_msg)
     finally:
         # Step 4: Clean up temporary files
-        if export_dir:
-            cleanup_export_directory(export_dir)
\ No newline at end of file
+        if temp_dir:
+            await asyncio.get_running_loop().run_in_executor(_io_pool, temp_dir.cleanup)
\ No newline at end of file
@@ -10,12 +10,53 @@ from bot.decorators import (
     log_command_usage
 )
 from bot_config.languages import Languages, Messages
-from database import db_session_context
+from database import (
+    db_session_context,
+    get_user_by_telegram_id,
+    invalidate_user_caches
+)
 from database.models import User
 
 logger = logging.getLogger(__name__)
 
 
+def _build_language_keyboard(selected_lang: str, callback_prefix: str) -> InlineKeyboardMarkup:
+    """Build the language selection keyboard with the selected language marked.
+    
+    Args:
+        selected_lang: Language code to mark with a checkmark
+        callback_prefix: Callback data prefix, followed by the language code
+        
+    Returns:
+        InlineKeyboardMarkup with one button per supported language
+    """
+    keyboard = []
+    for lang_code in Languages.SUPPORTED:
+        flag = Languages.FLAGS[lang_code]
+        name = Languages.NAMES[lang_code]
+        # Mark selected language
+        if lang_code == selected_lang:
+            button_text = f"✓ {flag} {name}"
+        else:
+            button_text = f"{flag} {name}"
+        
+        keyboard.append([InlineKeyboardButton(
+            button_text,
+            callback_data=f"{callback_prefix}{lang_code}"
+        )])
+    
+    return InlineKeyboardMarkup(keyboard)
+
+
+# Language keyboards only vary by the marked language, so build each once
+LANGUAGE_KEYBOARDS = {
+    lang: _build_language_keyboard(lang, "set_language_") for lang in Languages.SUPPORTED
+}
+INITIAL_LANGUAGE_KEYBOARDS = {
+    lang: _build_language_keyboard(lang, "initial_language_") for lang in Languages.SUPPORTED
+}
+
+
 def get_user_language(context: ContextTypes.DEFAULT_TYPE, user: User = None) -> str:
     """Get user's preferred language from context or user object"""
     # First check context
@@ -61,23 +102,8 @@ async def language_command(update: Update, context: ContextTypes.DEFAULT_TYPE, u
     """Handle /language command"""
     current_lang = get_user_language(context, user)
     
-    # Create language selection buttons
-    keyboard = []
-    for lang_code in Languages.SUPPORTED:
-        flag = Languages.FLAGS[lang_code]
-        name = Languages.NAMES[lang_code]
-        # Mark current language
-        if lang_code == current_lang:
-            button_text = f"✓ {flag} {name}"
-        else:
-            button_text = f"{flag} {name}"
-        
-        keyboard.append([InlineKeyboardButton(
-            button_text,
-            callback_data=f"set_language_{lang_code}"
-        )])
-    
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    # Language selection buttons with the current language marked
+    reply_markup = LANGUAGE_KEYBOARDS[current_lang]
     
     # Send message in current language
     message = get_message('LANGUAGE_SELECTION', current_lang)
@@ -95,12 +121,13 @@ async def language_callback(update: Update, context: ContextTypes.DEFAULT_TYPE)
         
         if new_lang in Languages.SUPPORTED:
             # Update user's language in database
-            telegram_id = str(query.from_user.id)
-            with db_session_context() as db:
-                user = db.query(User).filter_by(telegram_id=telegram_id).first()
+            telegram_id = query.from_user.id
+            async with db_session_context() as db:
+                user = await get_user_by_telegram_id(db, telegram_id)
                 if user:
                     user.language = new_lang
-                    db.commit()
+                    await db.commit()
+                    await invalidate_user_caches(telegram_id)
                     
                     # Update context
                     context.user_data['language'] = new_lang
@@ -8,7 +8,9 @@ Implements the 2-item Diabetes Distress Scale (DDS-2) with:
 from typing import Optional, Dict, Any
 import logging
 
+from aiolimiter import AsyncLimiter
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import BadRequest, Forbidden
 from telegram.ext import ContextTypes
 
 from bot.decorators import (
@@ -22,17 +24,29 @@ from bot.utils.common import (
     validate_user_context
 )
 from bot_config.bot_constants import BotMessages, ButtonLabels, CallbackData
+from bot_config.languages import Languages, Messages
 from bot.handlers.language import get_user_language, get_message
 from database import (
+    ActiveUser,
     db_session_context,
-    create_response,
-    get_user_by_telegram_id
+    queue_response,
+    get_cached_user_by_telegram_id,
+    set_questionnaire_state,
+    get_questionnaire_state,
+    clear_questionnaire_state
 )
 from database.constants import QuestionTypes, ResponseValues
 from database.models import User
 
 logger = logging.getLogger(__name__)
 
+# Support offer message key for each DDS-2 distress level
+SUPPORT_OFFER_MESSAGE_KEYS = {
+    'low': 'SUPPORT_OFFER_LOW',
+    'moderate': 'SUPPORT_OFFER_MODERATE',
+    'high': 'SUPPORT_OFFER_HIGH',
+}
+
 
 @require_registered_user
 @update_last_interaction
@@ -44,6 +58,7 @@ async def questionnaire_dds2(update: Update, context: ContextTypes.DEFAULT_TYPE,
     context.user_data['user_first_name'] = user.first_name
     context.user_data['dds2_mode'] = True
     context.user_data['dds2_responses'] = {}
+    await set_questionnaire_state(user.telegram_id, user_id=user.id, first_name=user.first_name)
     
     # Get user language
     lang = get_user_language(context, user)
@@ -56,8 +71,8 @@ async def questionnaire_dds2(update: Update, context: ContextTypes.DEFAULT_TYPE,
     await send_dds2_question_1(update.message, context)
 
 
-def _create_dds2_keyboard(question_num: int, lang: str = 'en') -> InlineKeyboardMarkup:
-    """Create DDS-2 scale keyboard for a question.
+def _build_dds2_keyboard(question_num: int, lang: str) -> InlineKeyboardMarkup:
+    """Build DDS-2 scale keyboard for a question.
     
     Args:
         question_num: Question number (1 or 2)
@@ -66,8 +81,6 @@ def _create_dds2_keyboard(question_num: int, lang: str = 'en') -> InlineKeyboard
     Returns:
         InlineKeyboardMarkup with 6-point scale buttons
     """
-    from bot_config.languages import Messages
-    
     callback_func = CallbackData.dds2_q1 if question_num == 1 else CallbackData.dds2_q2
     
     # Get button labels in the specified language
@@ -84,6 +97,60 @@ def _create_dds2_keyboard(question_num: int, lang: str = 'en') -> InlineKeyboard
     return InlineKeyboardMarkup(keyboard)
 
 
+def _build_support_offer_keyboard(lang: str) -> InlineKeyboardMarkup:
+    """Build the post-questionnaire support offer keyboard.
+    
+    Args:
+        lang: Language code for button labels
+        
+    Returns:
+        InlineKeyboardMarkup with start/decline support buttons
+    """
+    return InlineKeyboardMarkup([[
+        InlineKeyboardButton(get_message('SUPPORT_BUTTON_CHAT', lang), callback_data="start_support"),
+        InlineKeyboardButton(get_message('SUPPORT_BUTTON_NOT_NOW', lang), callback_data="decline_support")
+    ]])
+
+
+# Keyboards never change at runtime, so build them once per language at import
+DDS2_KEYBOARDS: Dict[tuple, InlineKeyboardMarkup] = {
+    (question_num, lang): _build_dds2_keyboard(question_num, lang)
+    for question_num in (1, 2)
+    for lang in Languages.SUPPORTED
+}
+SUPPORT_OFFER_KEYBOARDS: Dict[str, InlineKeyboardMarkup] = {
+    lang: _build_support_offer_keyboard(lang) for lang in Languages.SUPPORTED
+}
+
+# Intro template per language; the user name is filled in with str.replace
+# so a broadcast does not re-parse the format string for every user
+DDS2_INTRO_NAME_FIELD = '{user_name}'
+DDS2_INTRO_TEMPLATES: Dict[str, str] = {
+    lang: get_message('DDS2_INTRO', lang) for lang in Languages.SUPPORTED
+}
+
+# Question 1 text per language, reused by every scheduled send
+DDS2_Q1_TEXTS: Dict[str, str] = {
+    lang: get_message('DDS2_Q1_OVERWHELMED', lang) for lang in Languages.SUPPORTED
+}
+
+
+def _create_dds2_keyboard(question_num: int, lang: str = 'en') -> InlineKeyboardMarkup:
+    """Get the prebuilt DDS-2 scale keyboard for a question.
+    
+    Args:
+        question_num: Question number (1 or 2)
+        lang: Language code for button labels
+        
+    Returns:
+        InlineKeyboardMarkup with 6-point scale buttons
+    """
+    keyboard = DDS2_KEYBOARDS.get((question_num, lang))
+    if keyboard is None:
+        keyboard = DDS2_KEYBOARDS[(question_num, Languages.ENGLISH)]
+    return keyboard
+
+
 async def send_dds2_question_1(message: Any, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Send DDS-2 Question 1 with 6-point scale buttons.
     
@@ -101,7 +168,7 @@ async def send_dds2_question_1(message: Any, context: ContextTypes.DEFAULT_TYPE)
 
 
 async def _get_or_validate_user_id(query: Any, context: ContextTypes.DEFAULT_TYPE) -> Optional[int]:
-    """Get user ID from context or database.
+    """Get user ID from context, the questionnaire state cache, or database.
     
     Args:
         query: Telegram callback query
@@ -112,9 +179,19 @@ async def _get_or_validate_user_id(query: Any, context: ContextTypes.DEFAULT_TYP
     """
     user_id = validate_user_context(context)
     if not user_id:
-        telegram_id = str(query.from_user.id)
-        with db_session_context(commit=False) as db:
-            user = get_user_by_telegram_id(db, telegram_id)
+        telegram_id = query.from_user.id
+        
+        # Scheduled questionnaires and restarts leave user_data empty
+        state = await get_questionnaire_state(telegram_id)
+        if 'user_id' in state:
+            user_id = int(state['user_id'])
+            context.user_data['user_id'] = user_id
+            if 'q1' in state:
+                context.user_data.setdefault('dds2_responses', {}).setdefault('q1', int(state['q1']))
+            return user_id
+        
+        async with db_session_context(commit=False) as db:
+            user = await get_cached_user_by_telegram_id(db, telegram_id)
             if user:
                 user_id = user.id
                 context.user_data['user_id'] = user_id
@@ -128,29 +205,25 @@ async def _record_dds2_response(
     user_id: int, 
     question_type: str, 
     rating: int
-) -> bool:
-    """Record a DDS-2 response in the database.
+) -> None:
+    """Record a DDS-2 response through the batched database writer.
+    
+    Waits until the response is written, so the answer is only confirmed
+    to the user once it is stored.
     
     Args:
         user_id: User ID
         question_type: Question type constant
         rating: Response rating (1-6)
         
-    Returns:
-        True if successful, False otherwise
+    Raises:
+        Exception: If the response could not be queued or written
     """
-    try:
-        with db_session_context() as db:
-            create_response(
-                db=db,
-                user_id=user_id,
-                question_type=question_type,
-                response_value=str(rating)
-            )
-        return True
-    except Exception as e:
-        logger.error(f"Error recording DDS-2 response: {e}")
-        return False
+    await queue_response(
+        user_id=user_id,
+        question_type=question_type,
+        response_value=str(rating)
+    )
 
 
 @with_error_handling(error_message=BotMessages.ERROR_RECORDING_RESPONSE)
@@ -179,14 +252,14 @@ async def handle_dds2_q1_response(
     context.user_data['dds2_responses']['q1'] = rating
     
     # Record Q1 response
-    success = await _record_dds2_response(
+    await _record_dds2_response(
         user_id, 
         QuestionTypes.DDS2_Q1_OVERWHELMED, 
         rating
     )
-    if not success:
-        await send_error_message(query, BotMessages.ERROR_RECORDING_RESPONSE)
-        return
+    
+    # Keep Q1 so the total score survives a restart before Q2 is answered
+    await set_questionnaire_state(query.from_user.id, q1=rating)
     
     # Send transition message by editing the current message (removes buttons)
     lang = context.user_data.get('language', 'en')
@@ -243,22 +316,11 @@ async def _send_distress_level_response(
     await query.edit_message_text(message)
     
     # Always offer AI support after questionnaire
-    support_button_text = get_message('SUPPORT_BUTTON_CHAT', lang)
-    not_now_button_text = get_message('SUPPORT_BUTTON_NOT_NOW', lang)
-    
-    keyboard = [[
-        InlineKeyboardButton(support_button_text, callback_data="start_support"),
-        InlineKeyboardButton(not_now_button_text, callback_data="decline_support")
-    ]]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = SUPPORT_OFFER_KEYBOARDS.get(lang, SUPPORT_OFFER_KEYBOARDS[Languages.ENGLISH])
     
     # Customize message based on distress level
-    if distress_level == "high":
-        support_message = get_message('SUPPORT_OFFER_HIGH', lang)
-    elif distress_level == "moderate":
-        support_message = get_message('SUPPORT_OFFER_MODERATE', lang)
-    else:  # low
-        support_message = get_message('SUPPORT_OFFER_LOW', lang)
+    support_message_key = SUPPORT_OFFER_MESSAGE_KEYS.get(distress_level, 'SUPPORT_OFFER_LOW')
+    support_message = get_message(support_message_key, lang)
     
     await query.message.reply_text(
         support_message,
@@ -292,14 +354,11 @@ async def handle_dds2_q2_response(
     context.user_data['dds2_responses']['q2'] = rating
     
     # Record Q2 response
-    success = await _record_dds2_response(
+    await _record_dds2_response(
         user_id, 
         QuestionTypes.DDS2_Q2_FAILING, 
         rating
     )
-    if not success:
-        await send_error_message(query, BotMessages.ERROR_RECORDING_RESPONSE)
-        return
     
     # Calculate scores
     scores = _calculate_dds2_scores(context, rating)
@@ -314,6 +373,14 @@ async def handle_dds2_q2_response(
     # Clear temporary context data (keep scores for potential LLM use)
     context.user_data.pop('dds2_responses', None)
     context.user_data.pop('dds2_mode', None)
+    await clear_questionnaire_state(query.from_user.id)
+
+
+# Callback data -> (handler, rating) for every DDS-2 scale button
+DDS2_CALLBACK_HANDLERS = {
+    **{CallbackData.dds2_q1(i): (handle_dds2_q1_response, i) for i in range(1, 7)},
+    **{CallbackData.dds2_q2(i): (handle_dds2_q2_response, i) for i in range(1, 7)},
+}
 
 
 async def button_callback_dds2(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -321,53 +388,63 @@ async def button_callback_dds2(update: Update, context: ContextTypes.DEFAULT_TYP
     query = update.callback_query
     await query.answer()
     
-    # Check if this is a DDS-2 callback
-    if query.data.startswith(CallbackData.DDS2_Q1_PREFIX):
-        # Handle Question 1 response
-        rating = int(query.data.split("_")[-1])
-        await handle_dds2_q1_response(query, context, rating)
-    
-    elif query.data.startswith(CallbackData.DDS2_Q2_PREFIX):
-        # Handle Question 2 response
-        rating = int(query.data.split("_")[-1])
-        await handle_dds2_q2_response(query, context, rating)
-    
-    else:
+    route = DDS2_CALLBACK_HANDLERS.get(query.data)
+    if route is None:
         # Not a DDS-2 callback, pass to legacy handler
         return False
     
+    handler, rating = route
+    await handler(query, context, rating)
     return True
 
 
 # For scheduled questionnaires, we'll use the same flow
-async def send_scheduled_dds2(bot: Any, user: User) -> None:
+async def send_scheduled_dds2(
+    bot: Any, 
+    user: ActiveUser, 
+    chat_limiter: Optional[AsyncLimiter] = None
+) -> None:
     """Send scheduled DDS-2 questionnaire to a user.
     
     Args:
         bot: Telegram bot instance
-        user: User to send questionnaire to
+        user: Plain ActiveUser record, so no ORM attribute access per send
+        chat_limiter: Optional per-chat rate limiter; one token is taken
+            before each message
     """
     try:
         # Get user's language preference
         lang = user.language or 'en'
         
         # Send intro message in user's language
-        intro_text = get_message('DDS2_INTRO', lang, user_name=user.first_name)
+        intro_template = DDS2_INTRO_TEMPLATES.get(lang, DDS2_INTRO_TEMPLATES[Languages.ENGLISH])
+        intro_text = intro_template.replace(DDS2_INTRO_NAME_FIELD, user.first_name or '')
+        if chat_limiter is not None:
+            await chat_limiter.acquire()
         await bot.send_message(
             chat_id=user.telegram_id,
-            text=intro_text
+            text=intro_text,
+            parse_mode=None  # Plain text; skip entity parsing even if defaults set one
         )
         
         # Send first question with keyboard in user's language
-        question_text = get_message('DDS2_Q1_OVERWHELMED', lang)
+        question_text = DDS2_Q1_TEXTS.get(lang, DDS2_Q1_TEXTS[Languages.ENGLISH])
         reply_markup = _create_dds2_keyboard(1, lang)
+        if chat_limiter is not None:
+            await chat_limiter.acquire()
         await bot.send_message(
             chat_id=user.telegram_id,
             text=question_text,
-            reply_markup=reply_markup
+            reply_markup=reply_markup,
+            parse_mode=None  # Plain text; skip entity parsing even if defaults set one
         )
         
+        await set_questionnaire_state(user.telegram_id, user_id=user.id, first_name=user.first_name)
+        
         logger.info(f"Sent scheduled DDS-2 questionnaire to {user.first_name} (ID: {user.telegram_id}) in {lang}")
         
+    except (Forbidden, BadRequest):
+        # Let the scheduler handle blocked users and bad chats
+        raise
     except Exception as e:
         logger.error(f"Error sending scheduled DDS-2 to {user.telegram_id}: {e}")
\ No newline at end of file
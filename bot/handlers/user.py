@@ -8,6 +8,7 @@ Handles:
 from typing import Optional
 import logging
 
+from sqlalchemy import select, update as sql_update
 from telegram import Update
 from telegram.ext import ContextTypes
 
@@ -19,12 +20,22 @@ from bot.decorators import (
 from bot.utils.error_handling import handle_database_errors
 from bot.handlers.language import get_user_language, get_message
 from bot_config.bot_constants import BotSettings, LogMessages
-from database import db_session_context
+from database import (
+    db_session_context,
+    invalidate_user_caches
+)
 from database.constants import UserStatusValues
 from database.models import User, UserStatus
 
 logger = logging.getLogger(__name__)
 
+# Message key describing each user status in /status
+ALERT_STATUS_MESSAGE_KEYS = {
+    UserStatusValues.ACTIVE: 'ALERT_STATUS_ACTIVE',
+    UserStatusValues.INACTIVE: 'ALERT_STATUS_INACTIVE',
+    UserStatusValues.BLOCKED: 'ALERT_STATUS_BLOCKED',
+}
+
 
 @require_registered_user
 @update_last_interaction
@@ -34,13 +45,9 @@ async def status(update: Update, context: ContextTypes.DEFAULT_TYPE, user: User)
     # Get user's language preference
     lang = get_user_language(context, user)
     
-    # Determine alert status message
-    if user.status.value == UserStatusValues.ACTIVE:
-        alert_status = get_message('ALERT_STATUS_ACTIVE', lang)
-    elif user.status.value == UserStatusValues.INACTIVE:
-        alert_status = get_message('ALERT_STATUS_INACTIVE', lang)
-    else:  # blocked
-        alert_status = get_message('ALERT_STATUS_BLOCKED', lang)
+    # Determine alert status message (unknown statuses are shown as blocked)
+    alert_status_key = ALERT_STATUS_MESSAGE_KEYS.get(user.status.value, 'ALERT_STATUS_BLOCKED')
+    alert_status = get_message(alert_status_key, lang)
     
     # Get last interaction text
     never_interacted = get_message('NEVER_INTERACTED', lang)
@@ -74,15 +81,22 @@ async def pause_alerts(
     # Get user's language preference
     lang = get_user_language(context, user)
     
-    with db_session_context() as db:
-        # Update status to inactive
-        db_user = db.query(User).filter(User.id == user.id).first()
-        if db_user:
-            if db_user.status == UserStatus.inactive:
-                await update.message.reply_text(get_message('PAUSE_ALREADY_PAUSED', lang))
-            else:
-                db_user.status = UserStatus.inactive
-                await update.message.reply_text(get_message('PAUSE_SUCCESS', lang))
+    async with db_session_context() as db:
+        # Update status to inactive in one statement; no row means already paused
+        result = await db.execute(
+            sql_update(User)
+            .where(User.id == user.id, User.status != UserStatus.inactive)
+            .values(status=UserStatus.inactive)
+        )
+        paused = result.rowcount > 0
+    
+    if not paused:
+        await update.message.reply_text(get_message('PAUSE_ALREADY_PAUSED', lang))
+        return
+    
+    # Drop the cached row now that the status change is committed
+    await invalidate_user_caches(user.telegram_id)
+    await update.message.reply_text(get_message('PAUSE_SUCCESS', lang))
 
 
 @require_registered_user
@@ -104,14 +118,27 @@ async def resume_alerts(
     # Get user's language preference
     lang = get_user_language(context, user)
     
-    with db_session_context() as db:
-        # Update status to active
-        db_user = db.query(User).filter(User.id == user.id).first()
-        if db_user:
-            if db_user.status == UserStatus.active:
-                await update.message.reply_text(get_message('RESUME_ALREADY_ACTIVE', lang))
-            elif db_user.status == UserStatus.blocked:
-                await update.message.reply_text(get_message('RESUME_BLOCKED', lang))
-            else:
-                db_user.status = UserStatus.active
-                await update.message.reply_text(get_message('RESUME_SUCCESS', lang))
\ No newline at end of file
+    async with db_session_context() as db:
+        # Update status to active in one statement; only paused users can resume
+        result = await db.execute(
+            sql_update(User)
+            .where(User.id == user.id, User.status == UserStatus.inactive)
+            .values(status=UserStatus.active)
+        )
+        resumed = result.rowcount > 0
+        
+        # Nothing changed: read the current status to explain why
+        current_status = None if resumed else await db.scalar(
+            select(User.status).where(User.id == user.id)
+        )
+    
+    if not resumed:
+        if current_status == UserStatus.active:
+            await update.message.reply_text(get_message('RESUME_ALREADY_ACTIVE', lang))
+        elif current_status == UserStatus.blocked:
+            await update.message.reply_text(get_message('RESUME_BLOCKED', lang))
+        return
+    
+    # Drop the cached row now that the status change is committed
+    await invalidate_user_caches(user.telegram_id)
+    await update.message.reply_text(get_message('RESUME_SUCCESS', lang))
\ No newline at end of file
@@ -15,38 +15,54 @@ Naming conventions:
 - Constants: Imported from config modules using PascalCase classes
 - Async functions: Prefixed with action verb (send_, handle_, etc.)
 """
+import asyncio
 import logging
-import os
-import sys
 import warnings
 
+# uvloop is optional (it is not available on Windows)
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from telegram import Update, BotCommand
-from telegram.ext import Application, CommandHandler, CallbackQueryHandler, ContextTypes, ConversationHandler, MessageHandler, filters
+from telegram.request import HTTPXRequest
+from telegram.ext import (
+    AIORateLimiter, Application, CommandHandler, CallbackQueryHandler, ContextTypes,
+    ConversationHandler, MessageHandler, filters
+)
 
 from bot.decorators import (
-    require_registered_user, admin_only, log_command_usage
+    require_registered_user, admin_only, log_command_usage,
+    start_interaction_flusher, stop_interaction_flusher
 )
 from bot.handlers import (
     start, register, status, pause_alerts, resume_alerts,
     questionnaire_dds2, button_callback_dds2, export_data
 )
 from bot.handlers.auth import initial_language_callback
-from bot.handlers.language import language_command, language_callback
+from bot.handlers.language import (
+    get_user_language, get_message, language_command, language_callback
+)
 from bot.handlers.emotional_support import (
     start_support, handle_support_message, cancel_support, end_support, 
     command_during_support, command_confirmation_callback, CHATTING, support_callback
 )
-from bot.scheduler import send_scheduled_alerts
+from bot.llm_service import get_llm_service
+from bot.scheduler import run_alerts_now, start_scheduled_alerts
 from bot_config.bot_constants import (
     AlertSettings, BotSettings, BotMessages, LogMessages
 )
+from bot_config.network_constants import TelegramSettings
 from config import BOT_TOKEN, ENVIRONMENT, IS_DEVELOPMENT
+from database import (
+    db_session_context, get_cached_user_by_telegram_id,
+    start_response_flusher, stop_response_flusher
+)
 from database.models import User
 
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 # Enable logging
 logging.basicConfig(
     format=BotSettings.LOG_FORMAT,
@@ -62,12 +78,9 @@ scheduler = AsyncIOScheduler()
 @log_command_usage
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Send a message when the command /help is issued."""
-    from bot.handlers.language import get_user_language, get_message
-    from database import db_session_context, get_user_by_telegram_id
-    
-    telegram_id = str(update.effective_user.id)
-    with db_session_context(commit=False) as db:
-        user = get_user_by_telegram_id(db, telegram_id)
+    telegram_id = update.effective_user.id
+    async with db_session_context(commit=False) as db:
+        user = await get_cached_user_by_telegram_id(db, telegram_id)
         lang = get_user_language(context, user)
     
     help_text = get_message('HELP_TEXT', lang)
@@ -77,13 +90,9 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 @log_command_usage
 async def health_check(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Health check for monitoring"""
-    from bot.handlers.language import get_user_language, get_message
-    from database import db_session_context, get_user_by_telegram_id
-    from bot.llm_service import get_llm_service
-    
-    telegram_id = str(update.effective_user.id)
-    with db_session_context(commit=False) as db:
-        user = get_user_by_telegram_id(db, telegram_id)
+    telegram_id = update.effective_user.id
+    async with db_session_context(commit=False) as db:
+        user = await get_cached_user_by_telegram_id(db, telegram_id)
         lang = get_user_language(context, user)
     
     scheduler_status = "running" if scheduler.running else "stopped"
@@ -116,24 +125,27 @@ async def health_check(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 @log_command_usage
 async def send_alerts_now(update: Update, context: ContextTypes.DEFAULT_TYPE, user: User) -> None:
     """Manually trigger alerts to all active users"""
-    from bot.handlers.language import get_user_language, get_message
-    
     lang = get_user_language(context, user)
     
     await update.message.reply_text(get_message('SEND_ALERTS_START', lang))
-    await send_scheduled_alerts(context.bot)
-    await update.message.reply_text(get_message('SEND_ALERTS_COMPLETE', lang))
+    
+    async def _send_alerts_and_report() -> None:
+        # Shares the scheduled broadcast lock so the two never overlap
+        if await run_alerts_now(context.bot):
+            await update.message.reply_text(get_message('SEND_ALERTS_COMPLETE', lang))
+        else:
+            await update.message.reply_text(get_message('SEND_ALERTS_ALREADY_RUNNING', lang))
+    
+    # Run the broadcast in the background so this handler returns immediately
+    context.application.create_task(_send_alerts_and_report(), update=update)
 
 
 @log_command_usage
 async def done_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /done command - simple acknowledgment"""
-    from bot.handlers.language import get_user_language
-    from database import db_session_context, get_user_by_telegram_id
-    
-    telegram_id = str(update.effective_user.id)
-    with db_session_context(commit=False) as db:
-        user = get_user_by_telegram_id(db, telegram_id)
+    telegram_id = update.effective_user.id
+    async with db_session_context(commit=False) as db:
+        user = await get_cached_user_by_telegram_id(db, telegram_id)
         lang = get_user_language(context, user)
     
     # Send acknowledgment based on language
@@ -230,7 +242,7 @@ async def post_init(application: Application) -> None:
     if IS_DEVELOPMENT:
         # Development mode: run every N minutes
         scheduler.add_job(
-            send_scheduled_alerts,
+            start_scheduled_alerts,
             'interval',
             minutes=AlertSettings.DEV_ALERT_INTERVAL_MINUTES,
             args=[bot],
@@ -244,7 +256,7 @@ async def post_init(application: Application) -> None:
         # Production mode: schedule at specific times
         for idx, time_config in enumerate(AlertSettings.PROD_ALERT_TIMES):
             scheduler.add_job(
-                send_scheduled_alerts,
+                start_scheduled_alerts,
                 'cron',
                 hour=time_config['hour'],
                 minute=time_config['minute'],
@@ -259,6 +271,10 @@ async def post_init(application: Application) -> None:
     # Start scheduler
     scheduler.start()
     logger.info(LogMessages.SCHEDULER_STARTED)
+    
+    # Start batched last_interaction and response writes
+    start_interaction_flusher()
+    await start_response_flusher()
 
 
 async def post_shutdown(application: Application) -> None:
@@ -266,14 +282,50 @@ async def post_shutdown(application: Application) -> None:
     logger.info(LogMessages.SCHEDULER_STOPPING)
     scheduler.shutdown()
     logger.info(LogMessages.SCHEDULER_STOPPED)
+    
+    # Write any last_interaction timestamps and responses still pending
+    await stop_interaction_flusher()
+    await stop_response_flusher()
+
+
+def _build_request(pool_size: int) -> HTTPXRequest:
+    """Create a pooled HTTP/2 request object for Bot API calls."""
+    return HTTPXRequest(
+        connection_pool_size=pool_size,
+        pool_timeout=TelegramSettings.REQUEST_POOL_TIMEOUT,
+        read_timeout=TelegramSettings.REQUEST_READ_TIMEOUT,
+        write_timeout=TelegramSettings.REQUEST_WRITE_TIMEOUT,
+        connect_timeout=TelegramSettings.REQUEST_CONNECT_TIMEOUT,
+        http_version=TelegramSettings.HTTP_VERSION
+    )
 
 
 def main() -> None:
     """Start the bot with integrated scheduler"""
+    # Use the faster uvloop event loop when installed
+    if UVLOOP_AVAILABLE:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        logger.info("Using uvloop event loop")
+    
     # Create the Application with post_init and post_shutdown callbacks
     application = (
         Application.builder()
         .token(BOT_TOKEN)
+        # Broadcast sends must never wait on the pool, so keep it wider than
+        # the send semaphore with room left for handler replies
+        .request(_build_request(max(
+            TelegramSettings.REQUEST_POOL_SIZE,
+            AlertSettings.MAX_CONCURRENT_SENDS + TelegramSettings.REQUEST_POOL_HEADROOM
+        )))
+        # Long polling holds its connection open, so it gets its own small pool
+        .get_updates_request(_build_request(1))
+        .rate_limiter(AIORateLimiter(
+            overall_max_rate=AlertSettings.OVERALL_MAX_RATE,
+            overall_time_period=AlertSettings.OVERALL_TIME_PERIOD,
+            group_max_rate=AlertSettings.GROUP_MAX_RATE,
+            group_time_period=AlertSettings.GROUP_TIME_PERIOD,
+            max_retries=AlertSettings.RATE_LIMIT_MAX_RETRIES
+        ))
         .post_init(post_init)
         .post_shutdown(post_shutdown)
         .job_queue(None)  # Disable job queue due to Python 3.13 compatibility
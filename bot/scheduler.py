@@ -2,36 +2,64 @@
 
 Handles scheduled questionnaire sending to active users.
 """
-from typing import Any, List, Tuple
+from collections import OrderedDict
+from typing import Any, List, Optional, Set, Tuple
 import asyncio
 import logging
 
-from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+from aiolimiter import AsyncLimiter
 from telegram.error import Forbidden, BadRequest
 
 from bot.handlers.questionnaire_dds2 import send_scheduled_dds2
-from bot.utils.common import handle_blocked_user
-from bot_config.bot_constants import (
-    BotMessages, CallbackData, LogMessages, ButtonLabels, AlertSettings
+from bot.utils.common import handle_blocked_user, mark_users_blocked
+from bot_config.bot_constants import AlertSettings, LogMessages
+from database import (
+    ActiveUser, get_cached_active_users, peek_cached_active_users, readonly_session_context
 )
-from database import get_active_users, db_session_context
-from database.models import User, UserStatus
 
 logger = logging.getLogger(__name__)
 
+# Only one broadcast runs at a time; running tasks are kept referenced here
+_broadcast_lock = asyncio.Lock()
+_broadcast_tasks: Set[asyncio.Task] = set()
 
-async def send_questionnaire_to_user(bot: Any, user: User) -> bool:
+# Per-chat limiters (LRU). AIORateLimiter covers the global and group-chat
+# limits; this keeps bursts to any single private chat within Telegram's
+# private-chat limit. One token is taken per message sent.
+_chat_limiters: "OrderedDict[int, AsyncLimiter]" = OrderedDict()
+
+
+def _get_chat_limiter(telegram_id: int) -> AsyncLimiter:
+    """Get (or create) the rate limiter for a single chat."""
+    limiter = _chat_limiters.get(telegram_id)
+    if limiter is None:
+        limiter = AsyncLimiter(AlertSettings.PER_CHAT_MAX_RATE, AlertSettings.PER_CHAT_TIME_PERIOD)
+        _chat_limiters[telegram_id] = limiter
+        if len(_chat_limiters) > AlertSettings.PER_CHAT_MAX_TRACKED:
+            _chat_limiters.popitem(last=False)
+    else:
+        _chat_limiters.move_to_end(telegram_id)
+    return limiter
+
+
+async def send_questionnaire_to_user(
+    bot: Any, 
+    user: ActiveUser, 
+    blocked_users: Optional[List[ActiveUser]] = None
+) -> bool:
     """Send DDS-2 questionnaire to a single user.
     
     Args:
         bot: Telegram bot instance
         user: User to send questionnaire to
+        blocked_users: If given, users who blocked the bot are collected here
+            to be marked in one batch instead of being updated immediately
         
     Returns:
         True if sent successfully, False otherwise
     """
     try:
-        await send_scheduled_dds2(bot, user)
+        await send_scheduled_dds2(bot, user, _get_chat_limiter(user.telegram_id))
         return True
         
     except Forbidden:
@@ -41,7 +69,10 @@ async def send_questionnaire_to_user(bot: Any, user: User) -> bool:
                 telegram_id=user.telegram_id
             )
         )
-        await handle_blocked_user(user)
+        if blocked_users is not None:
+            blocked_users.append(user)
+        else:
+            await handle_blocked_user(user)
         return False
         
     except BadRequest as e:
@@ -63,17 +94,23 @@ async def send_questionnaire_to_user(bot: Any, user: User) -> bool:
         return False
 
 
-async def _get_active_users_for_alerts() -> List[User]:
+async def _get_active_users_for_alerts() -> List[ActiveUser]:
     """Get list of active users for sending alerts.
     
     Returns:
         List of active users
     """
-    with db_session_context(commit=False) as db:
-        return get_active_users(db)
+    # A cache hit needs no database connection at all
+    active_users = await peek_cached_active_users()
+    if active_users is not None:
+        return active_users
+    
+    # Read-only poll: an autocommit connection skips the BEGIN/ROLLBACK pair
+    async with readonly_session_context() as db:
+        return await get_cached_active_users(db)
 
 
-async def _send_alerts_to_users(bot: Any, users: List[User]) -> Tuple[int, int]:
+async def _send_alerts_to_users(bot: Any, users: List[ActiveUser]) -> Tuple[int, int]:
     """Send alerts to a list of users.
     
     Args:
@@ -83,18 +120,27 @@ async def _send_alerts_to_users(bot: Any, users: List[User]) -> Tuple[int, int]:
     Returns:
         Tuple of (sent_count, failed_count)
     """
-    sent_count = 0
-    failed_count = 0
+    # Sends run concurrently, bounded so a large broadcast does not queue
+    # thousands of requests at once; the application's AIORateLimiter paces them
+    semaphore = asyncio.Semaphore(AlertSettings.MAX_CONCURRENT_SENDS)
     
-    for user in users:
-        success = await send_questionnaire_to_user(bot, user)
-        if success:
-            sent_count += 1
-        else:
-            failed_count += 1
-        
-        # Small delay between messages to avoid rate limits
-        await asyncio.sleep(AlertSettings.MESSAGE_DELAY_SECONDS)
+    blocked_users: List[ActiveUser] = []
+    
+    async def _send_bounded(user: ActiveUser) -> bool:
+        async with semaphore:
+            return await send_questionnaire_to_user(bot, user, blocked_users)
+    
+    results = await asyncio.gather(
+        *(_send_bounded(user) for user in users),
+        return_exceptions=True
+    )
+    
+    # Users who blocked the bot are marked with one UPDATE after the fan-out
+    await mark_users_blocked(blocked_users)
+    
+    # Results are True, False or an exception; count the successful sends
+    sent_count = results.count(True)
+    failed_count = len(results) - sent_count
     
     return sent_count, failed_count
 
@@ -129,4 +175,56 @@ async def send_scheduled_alerts(bot: Any) -> None:
         )
         
     except Exception as e:
-        logger.error(LogMessages.ERROR_SCHEDULED_ALERT.format(error=e))
\ No newline at end of file
+        logger.error(LogMessages.ERROR_SCHEDULED_ALERT.format(error=e))
+
+
+async def _send_scheduled_alerts_exclusive(bot: Any) -> None:
+    """Run a broadcast, releasing the broadcast lock when it finishes."""
+    try:
+        await send_scheduled_alerts(bot)
+    finally:
+        _broadcast_lock.release()
+
+
+async def start_scheduled_alerts(bot: Any) -> None:
+    """Scheduler entry point that launches the broadcast in the background.
+    
+    Returns as soon as the broadcast task is started so a long broadcast
+    (many users, Telegram backoff) does not delay or skip scheduler ticks.
+    A tick that fires while the previous broadcast is still running is
+    skipped.
+    
+    Args:
+        bot: Telegram bot instance
+    """
+    if _broadcast_lock.locked():
+        logger.warning(LogMessages.ALERT_JOB_OVERRUN)
+        return
+    
+    # Taken here (it is free, so this does not wait) and released by the task
+    await _broadcast_lock.acquire()
+    task = asyncio.create_task(_send_scheduled_alerts_exclusive(bot))
+    _broadcast_tasks.add(task)
+    task.add_done_callback(_broadcast_tasks.discard)
+
+
+async def run_alerts_now(bot: Any) -> bool:
+    """Run a broadcast right away unless one is already in progress.
+    
+    Manual sends take the same lock as scheduled ones, so users never get
+    the questionnaire twice from overlapping broadcasts.
+    
+    Args:
+        bot: Telegram bot instance
+        
+    Returns:
+        True if the broadcast ran, False if another one was running
+    """
+    if _broadcast_lock.locked():
+        logger.warning(LogMessages.ALERT_JOB_OVERRUN)
+        return False
+    
+    # Taken here (it is free, so this does not wait) and released when done
+    await _broadcast_lock.acquire()
+    await _send_scheduled_alerts_exclusive(bot)
+    return True
@@ -4,15 +4,21 @@ This module contains reusable utility functions to reduce code duplication
 and standardize common patterns across the bot.
 """
 from functools import wraps
-from typing import Optional, Any, Callable, TypeVar, ParamSpec
+from typing import Optional, Any, Callable, Sequence, TypeVar, ParamSpec, Union
 import logging
 
+from sqlalchemy import update as sql_update
 from telegram import Update
 from telegram.error import Forbidden, BadRequest
 from telegram.ext import ContextTypes
 
 from bot_config.bot_constants import BotMessages, LogMessages
-from database import db_session_context, get_user_by_telegram_id
+from database import (
+    ActiveUser,
+    db_session_context,
+    get_cached_user_by_telegram_id,
+    invalidate_user_caches
+)
 from database.models import User, UserStatus
 
 logger = logging.getLogger(__name__)
@@ -69,10 +75,10 @@ async def get_user_from_update(update: Update) -> Optional[User]:
         logger.error("No effective user found in update")
         return None
     
-    telegram_id = str(telegram_user.id)
+    telegram_id = telegram_user.id
     
-    with db_session_context(commit=False) as db:
-        return get_user_by_telegram_id(db, telegram_id)
+    async with db_session_context(commit=False) as db:
+        return await get_cached_user_by_telegram_id(db, telegram_id)
 
 
 def with_error_handling(
@@ -89,6 +95,8 @@ def with_error_handling(
         Decorated function
     """
     def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        func_name = func.__name__
+
         @wraps(func)
         async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE, *args: P.args, **kwargs: P.kwargs) -> Optional[R]:
             try:
@@ -98,11 +106,11 @@ def with_error_handling(
                 return None
             except MessageSendError as e:
                 if log_errors:
-                    logger.error(f"{func.__name__} failed with MessageSendError: {e}")
+                    logger.error(f"{func_name} failed with MessageSendError: {e}")
                 return None
             except Exception as e:
                 if log_errors:
-                    logger.error(f"{func.__name__} failed with error: {e}", exc_info=True)
+                    logger.error(f"{func_name} failed with error: {e}", exc_info=True)
                 await send_error_message(update, error_message)
                 return None
         return wrapper
@@ -121,24 +129,58 @@ def with_database_transaction(commit: bool = True) -> Callable[[Callable[P, R]],
     def decorator(func: Callable[P, R]) -> Callable[P, R]:
         @wraps(func)
         async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
-            with db_session_context(commit=commit) as db:
+            async with db_session_context(commit=commit) as db:
                 kwargs['db'] = db
                 return await func(*args, **kwargs)
         return wrapper
     return decorator
 
 
-async def handle_blocked_user(user: User) -> None:
+async def handle_blocked_user(user: Union[User, ActiveUser]) -> None:
     """Update user status when they block the bot.
     
     Args:
-        user: The user who blocked the bot
+        user: The user who blocked the bot (only id and telegram_id are used)
+    """
+    async with db_session_context() as db:
+        # Single conditional UPDATE; no row means the user was already blocked
+        result = await db.execute(
+            sql_update(User)
+            .where(User.id == user.id, User.status != UserStatus.blocked)
+            .values(status=UserStatus.blocked)
+        )
+        blocked = result.rowcount > 0
+    
+    if blocked:
+        logger.info(LogMessages.USER_STATUS_UPDATED.format(telegram_id=user.telegram_id))
+        await invalidate_user_caches(user.telegram_id)
+
+
+async def mark_users_blocked(users: Sequence[ActiveUser]) -> None:
+    """Mark several users as blocked with a single UPDATE.
+    
+    Used after a broadcast so each blocked user does not cost its own
+    database transaction during the fan-out.
+    
+    Args:
+        users: Users whose sends failed with Forbidden
     """
-    with db_session_context() as db:
-        db_user = db.query(User).filter(User.id == user.id).first()
-        if db_user:
-            db_user.status = UserStatus.blocked
-            logger.info(LogMessages.USER_STATUS_UPDATED.format(telegram_id=user.telegram_id))
+    if not users:
+        return
+    
+    async with db_session_context() as db:
+        await db.execute(
+            sql_update(User)
+            .where(
+                User.id.in_([user.id for user in users]),
+                User.status != UserStatus.blocked
+            )
+            .values(status=UserStatus.blocked)
+        )
+    
+    for user in users:
+        logger.info(LogMessages.USER_STATUS_UPDATED.format(telegram_id=user.telegram_id))
+    await invalidate_user_caches(*(user.telegram_id for user in users))
 
 
 def validate_user_context(context: ContextTypes.DEFAULT_TYPE) -> Optional[int]:
@@ -97,6 +97,8 @@ def handle_telegram_errors(
         send_error_to_user: Whether to send error message to user
     """
     def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        func_name = func.__name__
+
         @wraps(func)
         async def wrapper(
             update: Update, 
@@ -109,20 +111,20 @@ def handle_telegram_errors(
             
             except Forbidden as e:
                 if log_errors:
-                    logger.warning(f"User blocked bot in {func.__name__}: {e}")
+                    logger.warning(f"User blocked bot in {func_name}: {e}")
                 # Don't send message since user blocked us
                 return None
             
             except BadRequest as e:
                 if log_errors:
-                    logger.error(f"Bad request in {func.__name__}: {e}")
+                    logger.error(f"Bad request in {func_name}: {e}")
                 if send_error_to_user:
                     await send_user_error(update, "generic")
                 return None
             
             except NetworkError as e:
                 if log_errors:
-                    logger.error(f"Network error in {func.__name__}: {e}")
+                    logger.error(f"Network error in {func_name}: {e}")
                 if send_error_to_user:
                     await send_user_error(
                         update, 
@@ -132,7 +134,7 @@ def handle_telegram_errors(
             
             except TelegramError as e:
                 if log_errors:
-                    logger.error(f"Telegram error in {func.__name__}: {e}")
+                    logger.error(f"Telegram error in {func_name}: {e}")
                 if send_error_to_user:
                     await send_user_error(update, "generic")
                 return None
@@ -152,6 +154,8 @@ def handle_database_errors(
         send_error_to_user: Whether to send error message to user
     """
     def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        func_name = func.__name__
+
         @wraps(func)
         async def wrapper(
             update: Update, 
@@ -163,7 +167,7 @@ def handle_database_errors(
                 return await func(update, context, *args, **kwargs)
             
             except DatabaseException as e:
-                logger.error(f"Database error in {func.__name__}: {e}")
+                logger.error(f"Database error in {func_name}: {e}")
                 if send_error_to_user:
                     await send_user_error(update, "database")
                 return None
@@ -171,7 +175,7 @@ def handle_database_errors(
             except Exception as e:
                 # Check if it's a SQLAlchemy error
                 if "sqlalchemy" in str(type(e)).lower():
-                    logger.error(f"SQLAlchemy error in {func.__name__}: {e}")
+                    logger.error(f"SQLAlchemy error in {func_name}: {e}")
                     if send_error_to_user:
                         await send_user_error(update, "database")
                     return None
@@ -195,6 +199,8 @@ def handle_all_errors(
         send_error_to_user: Whether to send error message to user
     """
     def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        func_name = func.__name__
+
         @wraps(func)
         async def wrapper(
             update: Update, 
@@ -218,7 +224,7 @@ def handle_all_errors(
             
             except ValidationException as e:
                 if log_errors:
-                    logger.error(f"Validation error in {func.__name__}: {e}")
+                    logger.error(f"Validation error in {func_name}: {e}")
                 if send_error_to_user:
                     await send_user_error(
                         update, 
@@ -228,14 +234,14 @@ def handle_all_errors(
             
             except DatabaseException as e:
                 if log_errors:
-                    logger.error(f"Database error in {func.__name__}: {e}")
+                    logger.error(f"Database error in {func_name}: {e}")
                 if send_error_to_user:
                     await send_user_error(update, "database")
                 return None
             
             except BotException as e:
                 if log_errors:
-                    logger.error(f"Bot error in {func.__name__}: {e}")
+                    logger.error(f"Bot error in {func_name}: {e}")
                 if send_error_to_user:
                     await send_user_error(update, "generic", error_message)
                 return None
@@ -243,7 +249,7 @@ def handle_all_errors(
             # Handle Telegram errors
             except TelegramError as e:
                 if log_errors:
-                    logger.error(f"Telegram error in {func.__name__}: {e}")
+                    logger.error(f"Telegram error in {func_name}: {e}")
                 if send_error_to_user:
                     await send_user_error(update, "generic", error_message)
                 return None
@@ -252,7 +258,7 @@ def handle_all_errors(
             except Exception as e:
                 if log_errors:
                     logger.error(
-                        f"Unexpected error in {func.__name__}: {e}", 
+                        f"Unexpected error in {func_name}: {e}", 
                         exc_info=True
                     )
                 if send_error_to_user:
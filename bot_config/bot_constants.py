@@ -16,8 +16,16 @@ class AlertSettings:
     # Expected responses per day for response rate calculation
     EXPECTED_RESPONSES_PER_DAY = 3
     
-    # Message delay between bulk sends (seconds)
-    MESSAGE_DELAY_SECONDS = 0.5
+    # Telegram Bot API rate limits applied by AIORateLimiter
+    OVERALL_MAX_RATE = 30      # Messages per OVERALL_TIME_PERIOD across all chats
+    OVERALL_TIME_PERIOD = 1    # Seconds
+    RATE_LIMIT_MAX_RETRIES = 3  # Retries after a RetryAfter (429) response
+    GROUP_MAX_RATE = 20        # Messages per GROUP_TIME_PERIOD to a single group chat
+    GROUP_TIME_PERIOD = 60     # Seconds
+    PER_CHAT_MAX_RATE = 1      # Messages per PER_CHAT_TIME_PERIOD to a single private chat
+    PER_CHAT_TIME_PERIOD = 1   # Seconds
+    PER_CHAT_MAX_TRACKED = 10000  # Per-chat limiters kept before evicting the oldest
+    MAX_CONCURRENT_SENDS = 25  # Questionnaires in flight at once during a broadcast
 
 
 # Bot Messages
@@ -255,6 +263,7 @@ Period: {start_date} to {end_date}
     # Admin messages
     SEND_ALERTS_START = "🔔 Sending alerts to all active users..."
     SEND_ALERTS_COMPLETE = "✅ Alert job completed"
+    SEND_ALERTS_ALREADY_RUNNING = "⏳ Alert job already running"
     ADMIN_ONLY_ACCESS = "❌ You don't have permission to use this command."
     
     # Rate limiting
@@ -319,12 +328,16 @@ class ExportSettings:
     DEFAULT_EXPORT_DAYS = 30
     MAX_EXPORT_DAYS = 365  # Maximum days for export
     MIN_EXPORT_DAYS = 1    # Minimum days for export
-    EXPORT_DIR_PREFIX = "temp_exports"
+    EXPORT_DIR_PREFIX = "dds2_export_"  # Prefix for per-export temporary directories
     XML_FILENAME = "data_export.xml"
     
     # Export cleanup
     EXPORT_CLEANUP_HOURS = 24  # Delete exports after 24 hours
     
+    # Worker pool sizes for export generation
+    GRAPH_PROCESS_WORKERS = 2  # Matplotlib rendering (separate processes)
+    IO_THREAD_WORKERS = 8      # XML writing and file system operations
+    
     # Graph filenames and captions
     GRAPHS = [
         ('distress_timeline.png', '📈 Distress Timeline'),
@@ -366,6 +379,9 @@ class BotSettings:
     SCHEDULER_COALESCE = True
     SCHEDULER_MAX_INSTANCES = 1
     
+    # Seconds between batched last_interaction writes
+    INTERACTION_FLUSH_INTERVAL_SECONDS = 5
+    
     # Bot timeouts
     CONVERSATION_TIMEOUT = 300  # 5 minutes for conversation handlers
     REQUEST_TIMEOUT = 30  # 30 seconds for API requests
@@ -373,6 +389,7 @@ class BotSettings:
     # Rate limiting
     MAX_COMMANDS_PER_MINUTE = 10
     MAX_EXPORTS_PER_DAY = 5
+    RATE_LIMIT_MAX_TRACKED_USERS = 10000  # LRU bound for per-user call history
     
     # File size limits
     MAX_EXPORT_FILE_SIZE_MB = 10
@@ -396,6 +413,7 @@ class LogMessages:
     ALERT_JOB_NO_USERS = "No active users to send alerts to"
     ALERT_JOB_FOUND_USERS = "Found {count} active users"
     ALERT_JOB_COMPLETE = "📊 Alert job completed: Sent: {sent}, Failed: {failed}"
+    ALERT_JOB_OVERRUN = "Previous alert broadcast still running, skipping this run"
     
     QUESTIONNAIRE_SENT = "✅ Sent questionnaire to {first_name} (ID: {telegram_id})"
     USER_BLOCKED_BOT = "⚠️ User {first_name} (ID: {telegram_id}) has blocked the bot"
@@ -461,6 +479,7 @@ class XMLConstants:
     # Formatting
     PERCENTAGE_FORMAT = "{:.2f}"
     INDENT_SPACES = "  "
+    XML_DECLARATION = '<?xml version="1.0" encoding="utf-8"?>\n'
 
 
 # Graph Settings
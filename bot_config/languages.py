@@ -340,6 +340,12 @@ Chestionarul folosește scala validată DDS-2:
         'ro': "✅ Chestionare trimise!"
     }
     
+    SEND_ALERTS_ALREADY_RUNNING = {
+        'en': "⏳ A questionnaire broadcast is already running, not sending again.",
+        'es': "⏳ Ya se está enviando una ronda de cuestionarios, no se enviará de nuevo.",
+        'ro': "⏳ O trimitere de chestionare este deja în curs, nu se retrimite."
+    }
+    
     # Rate limit
     RATE_LIMIT_EXCEEDED = {
         'en': "⏱️ Please wait before using this command again.",
@@ -50,6 +50,15 @@ class TelegramSettings:
     POLL_TIMEOUT = 60  # Long polling timeout
     POLL_INTERVAL = 0  # No delay between polls
     
+    # Bot API HTTP client (shared persistent pool, HTTP/2 multiplexing)
+    HTTP_VERSION = "2"
+    REQUEST_POOL_SIZE = 64
+    REQUEST_POOL_HEADROOM = 8  # connections kept free for handlers during broadcasts
+    REQUEST_POOL_TIMEOUT = 30  # seconds to wait for a free connection
+    REQUEST_READ_TIMEOUT = 20
+    REQUEST_WRITE_TIMEOUT = 20
+    REQUEST_CONNECT_TIMEOUT = 10
+    
     # Webhook settings
     WEBHOOK_MAX_CONNECTIONS = 40
     WEBHOOK_PENDING_UPDATE_LIMIT = 100
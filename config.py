@@ -26,6 +26,9 @@ DB_NAME = os.getenv('DB_NAME', 'diabetes_monitoring')
 # Encryption
 ENCRYPTION_KEY = os.getenv('ENCRYPTION_KEY')
 
+# Cache (optional) - Redis is only used when this is set
+REDIS_URL = os.getenv('REDIS_URL')
+
 
 # Admin settings
 # Comma-separated list of telegram IDs that have admin access
@@ -1,35 +1,59 @@
 """Database package for diabetes monitoring system"""
 
 # Import commonly used items for easier access
+from database.cache import (
+    get_cached_user_by_telegram_id,
+    peek_cached_active_users, get_cached_active_users, invalidate_user_caches,
+    set_questionnaire_state, get_questionnaire_state, clear_questionnaire_state
+)
 from database.constants import (
     UserStatusValues, QuestionTypes, ResponseValues,
-    DatabaseSettings, FieldLengths, DefaultValues, TableNames
+    DatabaseSettings, CacheSettings, ResponseBufferSettings, FieldLengths,
+    DefaultValues, TableNames
+)
+from database.database import (
+    get_db, SessionLocal, engine, Base, get_async_engine, get_async_session_factory
 )
-from database.database import get_db, SessionLocal, engine, Base
 from database.helpers import (
-    create_user, get_user_by_telegram_id, get_active_users,
-    update_last_interaction, create_response, get_user_responses,
+    ActiveUser, CachedUser, create_user, get_user_by_telegram_id, get_active_users,
+    get_active_users_minimal, update_last_interaction, create_response,
+    get_user_responses, ResponseRecord, get_user_response_records,
     create_assistant_interaction, get_user_interactions
 )
 from database.models import User, Response, AssistantInteraction, UserStatus
+from database.response_buffer import (
+    queue_response, flush_pending_responses,
+    start_response_flusher, stop_response_flusher
+)
 from database.session_utils import (
     db_session_context,
+    readonly_session_context,
     with_db_session,
     get_db_for_request
 )
 
-__all__ = [
+__all__ = (
     # Database
-    'get_db', 'SessionLocal', 'engine', 'Base',
+    'get_db', 'SessionLocal', 'engine', 'Base', 'get_async_engine', 'get_async_session_factory',
     # Models
     'User', 'Response', 'AssistantInteraction', 'UserStatus',
     # Helpers
-    'create_user', 'get_user_by_telegram_id', 'get_active_users',
-    'update_last_interaction', 'create_response', 'get_user_responses',
+    'ActiveUser', 'CachedUser', 'create_user', 'get_user_by_telegram_id', 'get_active_users',
+    'get_active_users_minimal', 'update_last_interaction', 'create_response',
+    'get_user_responses', 'ResponseRecord', 'get_user_response_records',
     'create_assistant_interaction', 'get_user_interactions',
+    # Cache
+    'get_cached_user_by_telegram_id',
+    'peek_cached_active_users', 'get_cached_active_users', 'invalidate_user_caches',
+    'set_questionnaire_state', 'get_questionnaire_state', 'clear_questionnaire_state',
+    # Response buffer
+    'queue_response', 'flush_pending_responses',
+    'start_response_flusher', 'stop_response_flusher',
     # Constants
     'UserStatusValues', 'QuestionTypes', 'ResponseValues',
-    'DatabaseSettings', 'FieldLengths', 'DefaultValues', 'TableNames',
+    'DatabaseSettings', 'CacheSettings', 'ResponseBufferSettings', 'FieldLengths',
+    'DefaultValues', 'TableNames',
     # Session utilities
-    'db_session_context', 'with_db_session', 'get_db_for_request'
-]
\ No newline at end of file
+    'db_session_context', 'readonly_session_context', 'with_db_session',
+    'get_db_for_request'
+)
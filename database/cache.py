@@ -0,0 +1,314 @@
+"""Optional Redis-backed cache for hot database lookups.
+
+Almost every bot handler starts by loading the user row by Telegram ID.
+This module fronts that lookup with a small in-process cache and, when
+REDIS_URL is configured and the redis package is installed, a shared Redis
+cache with a short TTL. Without Redis the in-process cache is used alone.
+The list of active users polled by the scheduler is cached the same way,
+and in-progress questionnaire state is kept in Redis so button callbacks can
+resolve the user without a database query, even after a restart.
+
+Redis only ever holds plain JSON: users are cached as CachedUser fields and
+the active user list as ActiveUser fields, and both are rebuilt on read. An
+entry that no longer decodes (e.g. after a field change) is treated as a miss.
+
+Callers that change a user row must call invalidate_user_caches afterwards,
+which drops both the user and the active user list in one Redis round-trip.
+The in-process copies only live a few seconds, so changes made by another
+process (e.g. the admin panel blocking a patient) reach the bot quickly.
+"""
+from collections import OrderedDict
+from time import monotonic
+from typing import Dict, List, Optional, Tuple, Union
+from datetime import datetime
+import json
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Check if Redis client is available
+try:
+    import redis.asyncio as redis
+    from redis.exceptions import RedisError
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+from config import REDIS_URL
+from database.constants import CacheSettings
+from database.helpers import (
+    ActiveUser, CachedUser, get_active_users_minimal, get_user_by_telegram_id
+)
+from database.models import UserStatus
+
+logger = logging.getLogger(__name__)
+
+redis_client = (
+    redis.from_url(REDIS_URL, decode_responses=False)
+    if REDIS_AVAILABLE and REDIS_URL else None
+)
+
+# In-process front cache: key -> (expires_at, user)
+_local_users: "OrderedDict[str, Tuple[float, CachedUser]]" = OrderedDict()
+
+# In-process copy of the active user list: (expires_at, users)
+_local_active_users: Optional[Tuple[float, List[ActiveUser]]] = None
+
+
+def user_cache_key(telegram_id: int) -> str:
+    """Build the cache key for a user looked up by Telegram ID."""
+    return f"{CacheSettings.USER_KEY_PREFIX}{telegram_id}"
+
+
+def _encode_user(user: CachedUser) -> bytes:
+    """Serialize a cached user to JSON."""
+    return json.dumps({
+        'id': user.id,
+        'telegram_id': user.telegram_id,
+        'first_name': user.first_name,
+        'family_name': user.family_name,
+        'language': user.language,
+        'status': user.status.value if user.status else None,
+        'registration_date': user.registration_date.isoformat() if user.registration_date else None,
+        'last_interaction': user.last_interaction.isoformat() if user.last_interaction else None,
+    }).encode()
+
+
+def _decode_user(raw: bytes) -> CachedUser:
+    """Rebuild a cached user from JSON.
+    
+    Raises:
+        ValueError, KeyError, TypeError: If the payload does not match CachedUser
+    """
+    fields = json.loads(raw)
+    return CachedUser(
+        id=fields['id'],
+        telegram_id=fields['telegram_id'],
+        first_name=fields['first_name'],
+        family_name=fields['family_name'],
+        language=fields['language'],
+        status=UserStatus(fields['status']) if fields['status'] else None,
+        registration_date=(
+            datetime.fromisoformat(fields['registration_date'])
+            if fields['registration_date'] else None
+        ),
+        last_interaction=(
+            datetime.fromisoformat(fields['last_interaction'])
+            if fields['last_interaction'] else None
+        )
+    )
+
+
+def _remember_locally(key: str, user: CachedUser) -> None:
+    """Store a user in the in-process cache, evicting the oldest entry if full."""
+    _local_users[key] = (monotonic() + CacheSettings.LOCAL_USER_TTL_SECONDS, user)
+    _local_users.move_to_end(key)
+    if len(_local_users) > CacheSettings.LOCAL_MAX_USERS:
+        _local_users.popitem(last=False)
+
+
+async def get_cached_user_by_telegram_id(db: AsyncSession, telegram_id: int) -> Optional[CachedUser]:
+    """Get user by telegram ID, serving repeated lookups from cache.
+    
+    Args:
+        db: Database session used on a cache miss
+        telegram_id: Telegram user ID
+        
+    Returns:
+        Read-only CachedUser if found, None otherwise
+    """
+    key = user_cache_key(telegram_id)
+    
+    entry = _local_users.get(key)
+    if entry is not None:
+        if entry[0] > monotonic():
+            return entry[1]
+        del _local_users[key]
+    
+    if redis_client is not None:
+        try:
+            raw = await redis_client.get(key)
+            if raw is not None:
+                user = _decode_user(raw)
+                _remember_locally(key, user)
+                return user
+        except RedisError as e:
+            logger.warning(f"Redis read failed for {key}: {e}")
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring undecodable cache entry {key}: {e}")
+    
+    row = await get_user_by_telegram_id(db, telegram_id)
+    if row is None:
+        # Don't cache misses so a fresh registration is visible immediately
+        return None
+    
+    user = CachedUser.from_user(row)
+    _remember_locally(key, user)
+    if redis_client is not None:
+        try:
+            await redis_client.set(key, _encode_user(user), ex=CacheSettings.USER_TTL_SECONDS)
+        except RedisError as e:
+            logger.warning(f"Redis write failed for {key}: {e}")
+    
+    return user
+
+
+async def peek_cached_active_users() -> Optional[List[ActiveUser]]:
+    """Get the active users from cache only, without touching the database.
+    
+    Lets callers skip checking out a database connection when the list is
+    cached.
+    
+    Returns:
+        List of ActiveUser records, or None on a cache miss
+    """
+    global _local_active_users
+    
+    if _local_active_users is not None and _local_active_users[0] > monotonic():
+        return _local_active_users[1]
+    
+    key = CacheSettings.ACTIVE_USERS_KEY
+    if redis_client is not None:
+        try:
+            raw = await redis_client.get(key)
+            if raw is not None:
+                active_users = [ActiveUser(*fields) for fields in json.loads(raw)]
+                _local_active_users = (monotonic() + CacheSettings.LOCAL_ACTIVE_USERS_TTL_SECONDS, active_users)
+                return active_users
+        except RedisError as e:
+            logger.warning(f"Redis read failed for {key}: {e}")
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Ignoring undecodable cache entry {key}: {e}")
+    
+    return None
+
+
+async def get_cached_active_users(db: AsyncSession) -> List[ActiveUser]:
+    """Get the active users to alert, serving repeated calls from cache.
+    
+    Only the fields needed to send a questionnaire are cached, so the
+    payload stays small regardless of what else lives on the user row.
+    
+    Args:
+        db: Database session used on a cache miss
+        
+    Returns:
+        List of ActiveUser records
+    """
+    global _local_active_users
+    
+    active_users = await peek_cached_active_users()
+    if active_users is not None:
+        return active_users
+    
+    key = CacheSettings.ACTIVE_USERS_KEY
+    active_users = await get_active_users_minimal(db)
+    
+    _local_active_users = (monotonic() + CacheSettings.LOCAL_ACTIVE_USERS_TTL_SECONDS, active_users)
+    if redis_client is not None:
+        try:
+            payload = json.dumps([
+                [user.id, user.telegram_id, user.first_name, user.language]
+                for user in active_users
+            ])
+            await redis_client.set(key, payload, ex=CacheSettings.ACTIVE_USERS_TTL_SECONDS)
+        except RedisError as e:
+            logger.warning(f"Redis write failed for {key}: {e}")
+    
+    return active_users
+
+
+async def invalidate_user_caches(*telegram_ids: int) -> None:
+    """Drop users and the active user list after user rows changed.
+    
+    All Redis deletes are sent in a single pipeline.
+    
+    Args:
+        telegram_ids: Telegram user IDs of the changed users
+    """
+    global _local_active_users
+    keys = [user_cache_key(telegram_id) for telegram_id in telegram_ids]
+    for key in keys:
+        _local_users.pop(key, None)
+    _local_active_users = None
+    
+    if redis_client is not None:
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                if keys:
+                    pipe.delete(*keys)
+                pipe.delete(CacheSettings.ACTIVE_USERS_KEY)
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Redis invalidation failed for {len(keys)} users: {e}")
+
+
+def questionnaire_state_key(telegram_id: int) -> str:
+    """Build the Redis key holding a user's in-progress questionnaire state."""
+    return f"{CacheSettings.QUESTIONNAIRE_STATE_KEY_PREFIX}{telegram_id}"
+
+
+async def set_questionnaire_state(telegram_id: int, **fields: Optional[Union[str, int]]) -> None:
+    """Store questionnaire state fields and refresh their TTL.
+    
+    Does nothing when Redis is not configured; callers keep the same state
+    in context.user_data as well.
+    
+    Args:
+        telegram_id: Telegram user ID
+        **fields: State fields to set (e.g. user_id, first_name, q1); None
+            values are skipped since Redis cannot store them
+    """
+    if redis_client is None:
+        return
+    
+    mapping = {name: value for name, value in fields.items() if value is not None}
+    if not mapping:
+        return
+    
+    key = questionnaire_state_key(telegram_id)
+    try:
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping=mapping)
+            pipe.expire(key, CacheSettings.QUESTIONNAIRE_STATE_TTL_SECONDS)
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Redis write failed for {key}: {e}")
+
+
+async def get_questionnaire_state(telegram_id: int) -> Dict[str, str]:
+    """Get a user's in-progress questionnaire state.
+    
+    Args:
+        telegram_id: Telegram user ID
+        
+    Returns:
+        Dict of state fields, empty if there is no state or no Redis
+    """
+    if redis_client is None:
+        return {}
+    
+    key = questionnaire_state_key(telegram_id)
+    try:
+        raw = await redis_client.hgetall(key)
+    except RedisError as e:
+        logger.warning(f"Redis read failed for {key}: {e}")
+        return {}
+    
+    return {field.decode(): value.decode() for field, value in raw.items()}
+
+
+async def clear_questionnaire_state(telegram_id: int) -> None:
+    """Remove a user's questionnaire state once the questionnaire is complete.
+    
+    Args:
+        telegram_id: Telegram user ID
+    """
+    if redis_client is None:
+        return
+    
+    key = questionnaire_state_key(telegram_id)
+    try:
+        await redis_client.delete(key)
+    except RedisError as e:
+        logger.warning(f"Redis invalidation failed for {key}: {e}")
@@ -1,5 +1,5 @@
 """Constants for the diabetes monitoring system database"""
-from typing import List
+from typing import Tuple
 
 # User Status Values
 class UserStatusValues:
@@ -8,10 +8,13 @@ class UserStatusValues:
     INACTIVE = "inactive"
     BLOCKED = "blocked"
     
+    # Built once; the getters return these shared tuples
+    ALL_VALUES = (ACTIVE, INACTIVE, BLOCKED)
+    
     @classmethod
-    def get_all_values(cls) -> List[str]:
+    def get_all_values(cls) -> Tuple[str, ...]:
         """Get all possible status values"""
-        return [cls.ACTIVE, cls.INACTIVE, cls.BLOCKED]
+        return cls.ALL_VALUES
 
 # Question Types
 class QuestionTypes:
@@ -24,16 +27,19 @@ class QuestionTypes:
     DISTRESS_CHECK = "distress_check"
     SEVERITY_RATING = "severity_rating"
     
+    # Built once; the getters return these shared tuples
+    ALL_TYPES = (DDS2_Q1_OVERWHELMED, DDS2_Q2_FAILING, DISTRESS_CHECK, SEVERITY_RATING)
+    DDS2_TYPES = (DDS2_Q1_OVERWHELMED, DDS2_Q2_FAILING)
+    
     @classmethod
-    def get_all_types(cls) -> List[str]:
+    def get_all_types(cls) -> Tuple[str, ...]:
         """Get all question types"""
-        return [cls.DDS2_Q1_OVERWHELMED, cls.DDS2_Q2_FAILING,
-                cls.DISTRESS_CHECK, cls.SEVERITY_RATING]
+        return cls.ALL_TYPES
     
     @classmethod
-    def get_dds2_types(cls) -> List[str]:
+    def get_dds2_types(cls) -> Tuple[str, ...]:
         """Get DDS-2 question types"""
-        return [cls.DDS2_Q1_OVERWHELMED, cls.DDS2_Q2_FAILING]
+        return cls.DDS2_TYPES
 
 # Response Values
 class ResponseValues:
@@ -61,6 +67,7 @@ class ResponseValues:
     DDS2_LOW_DISTRESS_THRESHOLD = 4   # Score 2-4: Low distress
     DDS2_MODERATE_DISTRESS_THRESHOLD = 8  # Score 5-8: Moderate distress
     # Score 9-12: High distress
+    DDS2_MAX_TOTAL_SCORE = 12
     
     # Legacy severity levels - DEPRECATED
     # These are kept only for data migration purposes
@@ -71,24 +78,31 @@ class ResponseValues:
     _LEGACY_SEVERITY_SEVERE = 4
     _LEGACY_SEVERITY_VERY_SEVERE = 5
     
+    # Built once; the getters return these shared tuples
+    BOOLEAN_VALUES = (YES, NO)
+    DDS2_VALUES = (DDS2_1, DDS2_2, DDS2_3, DDS2_4, DDS2_5, DDS2_6)
+    RATING_VALUES = (RATING_1, RATING_2, RATING_3, RATING_4, RATING_5)
+    
     @classmethod
-    def get_boolean_values(cls) -> List[str]:
+    def get_boolean_values(cls) -> Tuple[str, ...]:
         """Get boolean response values"""
-        return [cls.YES, cls.NO]
+        return cls.BOOLEAN_VALUES
     
     @classmethod
-    def get_dds2_values(cls) -> List[str]:
+    def get_dds2_values(cls) -> Tuple[str, ...]:
         """Get DDS-2 rating values (1-6)"""
-        return [cls.DDS2_1, cls.DDS2_2, cls.DDS2_3, cls.DDS2_4, cls.DDS2_5, cls.DDS2_6]
+        return cls.DDS2_VALUES
     
     @classmethod
-    def get_rating_values(cls) -> List[str]:
+    def get_rating_values(cls) -> Tuple[str, ...]:
         """Get legacy severity rating values (1-5) - for data migration only"""
-        return [cls.RATING_1, cls.RATING_2, cls.RATING_3, cls.RATING_4, cls.RATING_5]
+        return cls.RATING_VALUES
     
     @classmethod
     def calculate_dds2_distress_level(cls, total_score: int) -> str:
         """Calculate distress level from DDS-2 total score (2-12)"""
+        if 0 <= total_score <= cls.DDS2_MAX_TOTAL_SCORE:
+            return _DDS2_DISTRESS_LEVEL_BY_SCORE[total_score]
         if total_score <= cls.DDS2_LOW_DISTRESS_THRESHOLD:
             return "low"
         elif total_score <= cls.DDS2_MODERATE_DISTRESS_THRESHOLD:
@@ -96,15 +110,48 @@ class ResponseValues:
         else:
             return "high"
 
+
+# Distress level indexed directly by DDS-2 total score (0-12)
+_DDS2_DISTRESS_LEVEL_BY_SCORE = tuple(
+    "low" if score <= ResponseValues.DDS2_LOW_DISTRESS_THRESHOLD
+    else "moderate" if score <= ResponseValues.DDS2_MODERATE_DISTRESS_THRESHOLD
+    else "high"
+    for score in range(ResponseValues.DDS2_MAX_TOTAL_SCORE + 1)
+)
+
 # Database Settings
 class DatabaseSettings:
     """Database configuration constants"""
     CHARSET = "utf8mb4"
     COLLATION = "utf8mb4_unicode_ci"
     POOL_SIZE = 5
+    ASYNC_POOL_SIZE = 20
     MAX_OVERFLOW = 10
     POOL_TIMEOUT = 30
     POOL_RECYCLE = 3600
+    ASYNC_DRIVERNAME = "mysql+aiomysql"
+
+# Cache Settings
+class CacheSettings:
+    """Cache configuration constants"""
+    USER_KEY_PREFIX = "user:tg:"
+    USER_TTL_SECONDS = 300  # Redis TTL for cached user rows
+    LOCAL_USER_TTL_SECONDS = 5  # In-process front cache TTL
+    LOCAL_MAX_USERS = 1000
+    ACTIVE_USERS_KEY = "active_users"
+    ACTIVE_USERS_TTL_SECONDS = 60
+    LOCAL_ACTIVE_USERS_TTL_SECONDS = 5  # In-process copy; bounds staleness across processes
+    QUESTIONNAIRE_STATE_KEY_PREFIX = "q:state:"
+    QUESTIONNAIRE_STATE_TTL_SECONDS = 1800  # 30 minutes to answer a questionnaire
+
+# Response Buffer Settings
+class ResponseBufferSettings:
+    """Write-behind buffer configuration for questionnaire responses"""
+    FLUSH_INTERVAL_SECONDS = 0.25
+    BATCH_SIZE = 200  # Max rows per multi-row INSERT
+    MAX_QUEUED_RESPONSES = 5000  # New responses are rejected beyond this
+    MAX_WRITE_ATTEMPTS = 3  # A response failing this many writes is dropped
+    REDIS_PENDING_KEY = "responses:pending"
 
 # Field Lengths
 class FieldLengths:
@@ -112,7 +159,6 @@ class FieldLengths:
     # User fields
     NAME_LENGTH = 100
     ENCRYPTED_FIELD_LENGTH = 500
-    TELEGRAM_ID_LENGTH = 50
     EMAIL_LENGTH = 255
     PHONE_LENGTH = 20
     PASSPORT_LENGTH = 50
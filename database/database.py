@@ -6,11 +6,13 @@ This module handles:
 - Database initialization
 - Connection testing
 """
+from typing import Optional
 import logging
 import os
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, make_url, text
 from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -56,10 +58,52 @@ engine = create_engine(
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for the bot, so DB round-trips don't block the event loop.
+# Created on first use so the admin panel and scripts, which only use the
+# sync engine, never need the async driver.
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
 # Create Base class for models
 Base = declarative_base()
 
 
+def get_async_engine() -> AsyncEngine:
+    """Get the async engine, creating it on first use.
+    
+    Returns:
+        AsyncEngine: Engine using the async driver for the configured database
+    """
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            make_url(SQLALCHEMY_DATABASE_URL).set(drivername=DatabaseSettings.ASYNC_DRIVERNAME),
+            pool_size=DatabaseSettings.ASYNC_POOL_SIZE,
+            max_overflow=DatabaseSettings.MAX_OVERFLOW,
+            pool_timeout=DatabaseSettings.POOL_TIMEOUT,
+            pool_recycle=DatabaseSettings.POOL_RECYCLE,
+            pool_pre_ping=True,
+            echo=False
+        )
+    return _async_engine
+
+
+def get_async_session_factory() -> async_sessionmaker:
+    """Get the async session factory, creating it on first use.
+    
+    Sessions keep their objects usable after commit.
+    
+    Returns:
+        async_sessionmaker: Factory for sessions bound to the async engine
+    """
+    global _async_session_factory
+    if _async_session_factory is None:
+        _async_session_factory = async_sessionmaker(
+            get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    return _async_session_factory
+
+
 def get_db():
     """Get database session.
     
@@ -2,6 +2,12 @@
 
 This module provides encryption and decryption functionality for sensitive
 data stored in the database using Fernet symmetric encryption.
+
+The cipher is created once at import and reused for every field. Fernet runs
+AES and HMAC in OpenSSL, so its cost is per decrypted field rather than per
+call setup; hot queries avoid it by not loading encrypted columns at all
+(see SKIP_ENCRYPTED_COLUMNS in database.helpers). Stored values are Fernet
+tokens, so changing the scheme requires re-encrypting existing rows.
 """
 from typing import Optional, Union
 import logging
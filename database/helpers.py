@@ -11,22 +11,79 @@ Naming conventions:
   - telegram_id (not telegramId)
 - Parameters: snake_case with descriptive names
 """
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, List
+from typing import NamedTuple, Optional, List
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 
 from database.constants import DefaultValues
 from database.models import User, Response, AssistantInteraction, UserStatus
 
+# The bot never reads the encrypted columns, so skip loading (and decrypting) them
+SKIP_ENCRYPTED_COLUMNS = (
+    defer(User.passport_id),
+    defer(User.phone_number),
+    defer(User.email),
+)
+
+
+@dataclass(slots=True, frozen=True)
+class ActiveUser:
+    """Minimal user fields needed to send a scheduled questionnaire."""
+    id: int
+    telegram_id: int
+    first_name: str
+    language: str
+
+
+@dataclass(slots=True, frozen=True)
+class CachedUser:
+    """Read-only copy of the user fields the bot uses, safe to cache.
+    
+    The encrypted contact columns are deliberately not part of it.
+    """
+    id: int
+    telegram_id: int
+    first_name: str
+    family_name: str
+    language: str
+    status: UserStatus
+    registration_date: Optional[datetime]
+    last_interaction: Optional[datetime]
+    
+    @classmethod
+    def from_user(cls, user: User) -> "CachedUser":
+        """Copy the cached fields from a loaded User row."""
+        return cls(
+            id=user.id,
+            telegram_id=user.telegram_id,
+            first_name=user.first_name,
+            family_name=user.family_name,
+            language=user.language,
+            status=user.status,
+            registration_date=user.registration_date,
+            last_interaction=user.last_interaction
+        )
+
+
+class ResponseRecord(NamedTuple):
+    """Response fields needed to build an export, cheap to pickle to workers."""
+    response_timestamp: datetime
+    question_type: str
+    response_value: str
+
+
 # User helper functions
-def create_user(
-    db: Session, 
+async def create_user(
+    db: AsyncSession, 
     first_name: str, 
     family_name: str, 
     passport_id: str, 
     phone_number: str, 
-    telegram_id: str, 
+    telegram_id: int, 
     email: str
 ) -> User:
     """Create new user in database.
@@ -52,11 +109,11 @@ def create_user(
         email=email
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return user
 
-def get_user_by_telegram_id(db: Session, telegram_id: str) -> Optional[User]:
+async def get_user_by_telegram_id(db: AsyncSession, telegram_id: int) -> Optional[User]:
     """Get user by telegram ID.
     
     Args:
@@ -64,12 +121,17 @@ def get_user_by_telegram_id(db: Session, telegram_id: str) -> Optional[User]:
         telegram_id: Telegram user ID
         
     Returns:
-        User object if found, None otherwise
+        User object if found (encrypted fields not loaded), None otherwise
     """
-    return db.query(User).filter(User.telegram_id == telegram_id).first()
+    result = await db.execute(
+        select(User)
+        .options(*SKIP_ENCRYPTED_COLUMNS)
+        .where(User.telegram_id == telegram_id)
+    )
+    return result.scalars().first()
 
 
-def get_active_users(db: Session) -> List[User]:
+async def get_active_users(db: AsyncSession) -> List[User]:
     """Get all active users for sending alerts.
     
     Args:
@@ -78,24 +140,47 @@ def get_active_users(db: Session) -> List[User]:
     Returns:
         List of active User objects
     """
-    return db.query(User).filter(User.status == UserStatus.active).all()
+    result = await db.execute(
+        select(User)
+        .options(*SKIP_ENCRYPTED_COLUMNS)
+        .where(User.status == UserStatus.active)
+    )
+    return list(result.scalars().all())
+
 
+async def get_active_users_minimal(db: AsyncSession) -> List[ActiveUser]:
+    """Get the fields needed to message each active user.
+    
+    Only the columns in ActiveUser are selected, so no User objects are
+    loaded into the session for a broadcast.
+    
+    Args:
+        db: Database session
+        
+    Returns:
+        List of ActiveUser records
+    """
+    result = await db.execute(
+        select(User.id, User.telegram_id, User.first_name, User.language)
+        .where(User.status == UserStatus.active)
+    )
+    return [ActiveUser(*row) for row in result]
 
-def update_last_interaction(db: Session, user_id: int) -> None:
+async def update_last_interaction(db: AsyncSession, user_id: int) -> None:
     """Update user's last interaction timestamp.
     
     Args:
         db: Database session
         user_id: User's database ID
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if user:
         user.last_interaction = datetime.now()
-        db.commit()
+        await db.commit()
 
 # Response helper functions
-def create_response(
-    db: Session, 
+async def create_response(
+    db: AsyncSession, 
     user_id: int, 
     question_type: str, 
     response_value: str
@@ -117,17 +202,17 @@ def create_response(
         response_value=response_value
     )
     db.add(response)
-    db.commit()
-    db.refresh(response)
+    await db.commit()
+    await db.refresh(response)
     
     # Update last interaction
-    update_last_interaction(db, user_id)
+    await update_last_interaction(db, user_id)
     
     return response
 
 
-def get_user_responses(
-    db: Session, 
+async def get_user_responses(
+    db: AsyncSession, 
     user_id: int, 
     start_date: datetime, 
     end_date: datetime
@@ -143,15 +228,46 @@ def get_user_responses(
     Returns:
         List of Response objects ordered by timestamp (descending)
     """
-    return db.query(Response).filter(
-        Response.user_id == user_id,
-        Response.response_timestamp >= start_date,
-        Response.response_timestamp <= end_date
-    ).order_by(Response.response_timestamp.desc()).all()
+    result = await db.execute(
+        select(Response).where(
+            Response.user_id == user_id,
+            Response.response_timestamp >= start_date,
+            Response.response_timestamp <= end_date
+        ).order_by(Response.response_timestamp.desc())
+    )
+    return list(result.scalars().all())
+
+
+async def get_user_response_records(
+    db: AsyncSession, 
+    user_id: int, 
+    start_date: datetime, 
+    end_date: datetime
+) -> List[ResponseRecord]:
+    """Get the exported fields of user responses within date range.
+    
+    Args:
+        db: Database session
+        user_id: User's database ID
+        start_date: Start date for filtering
+        end_date: End date for filtering
+        
+    Returns:
+        List of ResponseRecord tuples ordered by timestamp (ascending)
+    """
+    result = await db.execute(
+        select(Response.response_timestamp, Response.question_type, Response.response_value)
+        .where(
+            Response.user_id == user_id,
+            Response.response_timestamp >= start_date,
+            Response.response_timestamp <= end_date
+        ).order_by(Response.response_timestamp)
+    )
+    return [ResponseRecord(*row) for row in result]
 
 # Assistant interaction helper functions
-def create_assistant_interaction(
-    db: Session, 
+async def create_assistant_interaction(
+    db: AsyncSession, 
     user_id: int, 
     prompt: str, 
     response: str
@@ -173,17 +289,17 @@ def create_assistant_interaction(
         response=response
     )
     db.add(interaction)
-    db.commit()
-    db.refresh(interaction)
+    await db.commit()
+    await db.refresh(interaction)
     
     # Update last interaction
-    update_last_interaction(db, user_id)
+    await update_last_interaction(db, user_id)
     
     return interaction
 
 
-def get_user_interactions(
-    db: Session, 
+async def get_user_interactions(
+    db: AsyncSession, 
     user_id: int, 
     limit: int = DefaultValues.INTERACTION_LIMIT
 ) -> List[AssistantInteraction]:
@@ -197,6 +313,9 @@ def get_user_interactions(
     Returns:
         List of AssistantInteraction objects ordered by timestamp (descending)
     """
-    return db.query(AssistantInteraction).filter(
-        AssistantInteraction.user_id == user_id
-    ).order_by(AssistantInteraction.interaction_timestamp.desc()).limit(limit).all()
\ No newline at end of file
+    result = await db.execute(
+        select(AssistantInteraction).where(
+            AssistantInteraction.user_id == user_id
+        ).order_by(AssistantInteraction.interaction_timestamp.desc()).limit(limit)
+    )
+    return list(result.scalars().all())
\ No newline at end of file
@@ -1,6 +1,6 @@
 import enum
 
-from sqlalchemy import Column, Integer, String, Enum, ForeignKey, Text, TIMESTAMP
+from sqlalchemy import BigInteger, Column, Integer, String, Enum, ForeignKey, Index, Text, TIMESTAMP
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -23,7 +23,7 @@ class User(Base):
     family_name = Column(String(FieldLengths.NAME_LENGTH), nullable=False)
     passport_id = Column(EncryptedType(FieldLengths.ENCRYPTED_FIELD_LENGTH), unique=True)
     phone_number = Column(EncryptedType(FieldLengths.ENCRYPTED_FIELD_LENGTH))
-    telegram_id = Column(String(FieldLengths.TELEGRAM_ID_LENGTH), unique=True, nullable=False)
+    telegram_id = Column(BigInteger, unique=True, nullable=False)
     email = Column(EncryptedType(FieldLengths.ENCRYPTED_FIELD_LENGTH))
     language = Column(String(5), nullable=False, server_default='en')  # en, es, ro
     status = Column(Enum(UserStatus), default=UserStatus.active)
@@ -53,6 +53,13 @@ class Response(Base):
     # Relationships
     user = relationship("User", back_populates="responses")
     
+    # Per-user date range reads (exports, reports) seek and order on the first
+    # index; reads filtered to one question type use the second
+    __table_args__ = (
+        Index('ix_responses_user_timestamp_type', 'user_id', 'response_timestamp', 'question_type'),
+        Index('ix_responses_user_type_timestamp', 'user_id', 'question_type', 'response_timestamp'),
+    )
+    
     def __repr__(self):
         return f"<Response(id={self.id}, user_id={self.user_id}, type={self.question_type}, value={self.response_value})>"
 
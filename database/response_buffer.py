@@ -0,0 +1,281 @@
+"""Write-behind buffer for questionnaire responses.
+
+Questionnaire callbacks arrive in bursts right after a scheduled send, and
+inserting each answer in its own transaction costs one round-trip per click.
+Handlers queue responses here instead; a background task drains the queue on
+a short interval and writes each batch with a single multi-row INSERT. Every
+queued response carries a future that resolves once its row is written, so
+handlers only confirm an answer after it is stored.
+
+If a batch fails, its rows are retried one at a time so a single bad row
+cannot hold back the others. A row that still fails is re-queued until it has
+failed MAX_WRITE_ATTEMPTS writes, then dropped and its future raises.
+
+On shutdown the queue is flushed one last time. Rows that still cannot be
+written are parked in Redis (when configured) and re-queued on next start.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import asyncio
+import json
+import logging
+
+from sqlalchemy import insert, update
+
+# Redis is only needed to park unwritten rows across restarts
+try:
+    from redis.exceptions import RedisError
+except ImportError:
+    RedisError = Exception
+
+from database.cache import redis_client
+from database.constants import ResponseBufferSettings
+from database.models import Response, User
+from database.session_utils import db_session_context
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class QueuedResponse:
+    """A response row waiting to be written"""
+    row: Dict[str, Any]
+    written: Optional["asyncio.Future[None]"] = None
+    attempts: int = 0
+
+
+_response_queue: "asyncio.Queue[QueuedResponse]" = asyncio.Queue(
+    maxsize=ResponseBufferSettings.MAX_QUEUED_RESPONSES
+)
+_response_flusher: Optional[asyncio.Task] = None
+_response_flusher_stop: Optional[asyncio.Event] = None
+
+
+def queue_response(user_id: int, question_type: str, response_value: str) -> "asyncio.Future[None]":
+    """Queue a questionnaire response to be written in the next batch.
+    
+    Args:
+        user_id: User's database ID
+        question_type: Type of question (from QuestionTypes)
+        response_value: User's response value
+        
+    Returns:
+        Future that resolves once the response is written and raises if
+        the response had to be dropped
+        
+    Raises:
+        asyncio.QueueFull: If MAX_QUEUED_RESPONSES responses are already waiting
+    """
+    written = asyncio.get_running_loop().create_future()
+    _response_queue.put_nowait(QueuedResponse(
+        row={
+            'user_id': user_id,
+            'question_type': question_type,
+            'response_value': response_value,
+            'response_timestamp': datetime.now()
+        },
+        written=written
+    ))
+    return written
+
+
+def _resolve(item: QueuedResponse, error: Optional[Exception] = None) -> None:
+    """Tell whoever queued a response whether it was stored."""
+    if item.written is None or item.written.done():
+        return
+    if error is None:
+        item.written.set_result(None)
+    else:
+        item.written.set_exception(error)
+
+
+def _requeue(item: QueuedResponse) -> None:
+    """Put a response back for the next flush, dropping it if the queue is full."""
+    try:
+        _response_queue.put_nowait(item)
+    except asyncio.QueueFull as e:
+        logger.error(f"Dropping response for user {item.row['user_id']}: response queue is full")
+        _resolve(item, e)
+
+
+def _drain_batch() -> List[QueuedResponse]:
+    """Take up to one batch of queued responses without waiting."""
+    batch = []
+    while len(batch) < ResponseBufferSettings.BATCH_SIZE and not _response_queue.empty():
+        batch.append(_response_queue.get_nowait())
+    return batch
+
+
+async def _write_batch(rows: List[Dict[str, Any]]) -> None:
+    """Insert a batch of responses and bump the users' last interaction."""
+    # Latest response time per user, matching what create_response records
+    last_interactions: Dict[int, datetime] = {}
+    for row in rows:
+        last_interactions[row['user_id']] = row['response_timestamp']
+
+    async with db_session_context() as db:
+        await db.execute(insert(Response), rows)
+        await db.execute(
+            update(User),
+            [
+                {'id': user_id, 'last_interaction': timestamp}
+                for user_id, timestamp in last_interactions.items()
+            ]
+        )
+
+
+async def _write_individually(batch: List[QueuedResponse]) -> int:
+    """Write the rows of a failed batch one at a time.
+    
+    Rows that fail again are re-queued, or dropped once they have failed
+    MAX_WRITE_ATTEMPTS times.
+    
+    Returns:
+        Number of responses written
+    """
+    written = 0
+    for item in batch:
+        try:
+            await _write_batch([item.row])
+        except Exception as e:
+            item.attempts += 1
+            if item.attempts >= ResponseBufferSettings.MAX_WRITE_ATTEMPTS:
+                logger.error(
+                    f"Dropping response {item.row['question_type']} for user "
+                    f"{item.row['user_id']} after {item.attempts} failed writes: {e}"
+                )
+                _resolve(item, e)
+            else:
+                _requeue(item)
+            continue
+
+        _resolve(item)
+        written += 1
+
+    return written
+
+
+async def flush_pending_responses() -> int:
+    """Write all queued responses in batches of at most BATCH_SIZE rows.
+    
+    Returns:
+        Number of responses written
+    """
+    written = 0
+    while True:
+        batch = _drain_batch()
+        if not batch:
+            return written
+
+        try:
+            await _write_batch([item.row for item in batch])
+        except Exception as e:
+            logger.warning(f"Failed to write {len(batch)} queued responses, retrying one by one: {e}")
+            # Anything still failing waits for the next flush
+            return written + await _write_individually(batch)
+
+        for item in batch:
+            _resolve(item)
+        written += len(batch)
+
+
+async def _run_response_flusher(interval_seconds: float, stop: asyncio.Event) -> None:
+    """Periodically flush queued responses until stop is set.
+    
+    The task is stopped through the event rather than cancelled, so a batch
+    that was already taken off the queue is always written or re-queued.
+    """
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval_seconds)
+        except asyncio.TimeoutError:
+            await flush_pending_responses()
+
+
+async def _restore_parked_responses() -> None:
+    """Re-queue responses parked in Redis by a previous shutdown."""
+    if redis_client is None:
+        return
+
+    key = ResponseBufferSettings.REDIS_PENDING_KEY
+    try:
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.lrange(key, 0, -1)
+            pipe.delete(key)
+            payloads, _ = await pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Could not restore parked responses from Redis: {e}")
+        return
+
+    for payload in payloads:
+        try:
+            row = json.loads(payload)
+            row['response_timestamp'] = datetime.fromisoformat(row['response_timestamp'])
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error(f"Skipping unreadable parked response: {e}")
+            continue
+        _requeue(QueuedResponse(row=row))
+    if payloads:
+        logger.info(f"Restored {len(payloads)} parked responses from Redis")
+
+
+async def _park_pending_responses() -> None:
+    """Move responses that could not be written into Redis."""
+    items = []
+    while not _response_queue.empty():
+        items.append(_response_queue.get_nowait())
+    if not items:
+        return
+
+    if redis_client is None:
+        logger.error(f"Dropping {len(items)} unwritten responses: Redis is not configured")
+        error = RuntimeError("Response could not be written before shutdown")
+        for item in items:
+            _resolve(item, error)
+        return
+
+    try:
+        await redis_client.rpush(
+            ResponseBufferSettings.REDIS_PENDING_KEY,
+            *(
+                json.dumps({**item.row, 'response_timestamp': item.row['response_timestamp'].isoformat()})
+                for item in items
+            )
+        )
+        logger.warning(f"Parked {len(items)} unwritten responses in Redis")
+    except RedisError as e:
+        logger.error(f"Dropping {len(items)} unwritten responses: {e}")
+        for item in items:
+            _resolve(item, e)
+        return
+
+    # Parked rows are written on next start
+    for item in items:
+        _resolve(item)
+
+
+async def start_response_flusher(
+    interval_seconds: float = ResponseBufferSettings.FLUSH_INTERVAL_SECONDS
+) -> None:
+    """Start the background task that batches response inserts."""
+    global _response_flusher, _response_flusher_stop
+    if _response_flusher is None or _response_flusher.done():
+        await _restore_parked_responses()
+        _response_flusher_stop = asyncio.Event()
+        _response_flusher = asyncio.create_task(
+            _run_response_flusher(interval_seconds, _response_flusher_stop)
+        )
+
+
+async def stop_response_flusher() -> None:
+    """Stop the background flusher, write remaining responses and park the rest."""
+    global _response_flusher, _response_flusher_stop
+    if _response_flusher is not None:
+        # Let an in-progress flush finish instead of cancelling it mid-write
+        _response_flusher_stop.set()
+        await _response_flusher
+        _response_flusher = None
+        _response_flusher_stop = None
+    await flush_pending_responses()
+    await _park_pending_responses()
@@ -1,13 +1,13 @@
 """Database session management utilities for eliminating code duplication"""
-from contextlib import contextmanager
+from contextlib import asynccontextmanager
 from functools import wraps
 import logging
-from typing import TypeVar, Callable
+from typing import AsyncIterator, Awaitable, TypeVar, Callable
 
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.database import SessionLocal
+from database.database import get_async_engine, get_async_session_factory
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -16,84 +16,109 @@ logger = logging.getLogger(__name__)
 T = TypeVar('T')
 
 
-@contextmanager
-def db_session_context(commit: bool = True, rollback_on_error: bool = True) -> Session:
+@asynccontextmanager
+async def db_session_context(commit: bool = True, rollback_on_error: bool = True) -> AsyncIterator[AsyncSession]:
     """
-    Context manager for database sessions with automatic cleanup and error handling.
+    Async context manager for database sessions with automatic cleanup and error handling.
     
     Args:
         commit: Whether to commit the transaction on successful completion (default: True)
         rollback_on_error: Whether to rollback on exceptions (default: True)
     
     Yields:
-        Session: Database session object
+        AsyncSession: Database session object
     
     Example:
-        with db_session_context() as db:
-            user = db.query(User).filter(User.id == 1).first()
+        async with db_session_context() as db:
+            user = await db.get(User, 1)
             user.name = "New Name"
             # Automatically commits and closes
     """
-    db = SessionLocal()
+    db = get_async_session_factory()()
     try:
         logger.debug("Opening database session")
         yield db
         if commit:
-            db.commit()
+            await db.commit()
             logger.debug("Database transaction committed")
     except SQLAlchemyError as e:
         logger.error(f"Database error occurred: {e}")
         if rollback_on_error:
-            db.rollback()
+            await db.rollback()
             logger.debug("Database transaction rolled back")
         raise
     except Exception as e:
         logger.error(f"Unexpected error in database operation: {e}")
         if rollback_on_error:
-            db.rollback()
+            await db.rollback()
             logger.debug("Database transaction rolled back")
         raise
     finally:
-        db.close()
+        await db.close()
         logger.debug("Database session closed")
 
 
+@asynccontextmanager
+async def readonly_session_context() -> AsyncIterator[AsyncSession]:
+    """
+    Async context manager for read-only queries on an autocommit connection.
+    
+    The connection runs in AUTOCOMMIT mode, so each SELECT is executed on its
+    own without a surrounding BEGIN/ROLLBACK pair. Only use this for reads;
+    nothing written through the session is committed as a unit.
+    
+    Yields:
+        AsyncSession: Database session bound to the autocommit connection
+    
+    Example:
+        async with readonly_session_context() as db:
+            users = await get_active_users(db)
+    """
+    async with get_async_engine().connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        db = AsyncSession(bind=conn, autoflush=False, expire_on_commit=False)
+        try:
+            yield db
+        finally:
+            await db.close()
+
+
 def with_db_session(commit: bool = True, rollback_on_error: bool = True) -> Callable:
     """
-    Decorator that provides a database session to the decorated function.
+    Decorator that provides a database session to the decorated coroutine.
     
     Args:
         commit: Whether to commit the transaction on successful completion (default: True)
         rollback_on_error: Whether to rollback on exceptions (default: True)
     
     Returns:
-        Decorated function with database session as first argument
+        Decorated coroutine with database session as first argument
     
     Example:
         @with_db_session()
-        def update_user(db: Session, user_id: int, name: str):
-            user = db.query(User).filter(User.id == user_id).first()
+        async def update_user(db: AsyncSession, user_id: int, name: str):
+            user = await db.get(User, user_id)
             user.name = name
             # Automatically commits
     """
-    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
         @wraps(func)
-        def wrapper(*args, **kwargs) -> T:
-            with db_session_context(commit=commit, rollback_on_error=rollback_on_error) as db:
-                return func(db, *args, **kwargs)
+        async def wrapper(*args, **kwargs) -> T:
+            async with db_session_context(commit=commit, rollback_on_error=rollback_on_error) as db:
+                return await func(db, *args, **kwargs)
         return wrapper
     return decorator
 
 
-def get_db_for_request() -> Session:
+def get_db_for_request() -> AsyncSession:
     """
     Get a database session for use in request handlers.
     
     Returns:
-        Session: Database session object
+        AsyncSession: Database session object
     
     Note:
         This is a simple session getter for cases where context managers
-        or decorators aren't suitable. Remember to close the session manually.
+        or decorators aren't suitable. Remember to await close() manually.
     """
-    return SessionLocal()
\ No newline at end of file
+    return get_async_session_factory()()
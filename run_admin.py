@@ -5,6 +5,10 @@ Run the Admin backend server with uvicorn.
 This script provides a convenient way to start the admin panel with proper
 Python path configuration and command-line arguments for development.
 
+The server uses the uvloop event loop and the httptools HTTP parser in every
+environment when they are installed (they ship with ``uvicorn[standard]``,
+which requirements.txt pins); otherwise uvicorn picks what is available.
+
 Usage examples:
     # Run with default settings (from .env)
     ./run_admin.py
@@ -24,17 +28,41 @@ Usage examples:
 from pathlib import Path
 import argparse
 import logging
+import os
 import sys
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent))
 
-import uvicorn
+from dotenv import load_dotenv
+
+# uvloop and httptools ship with uvicorn[standard]; use them whenever installed
+try:
+    import httptools  # noqa: F401
+    import uvloop  # noqa: F401
+    FAST_SERVER_LIBS_AVAILABLE = True
+except ImportError:
+    FAST_SERVER_LIBS_AVAILABLE = False
+
+
+# Environment variables the admin settings cannot be built without
+REQUIRED_ENV_VARS = ('ADMIN_SECRET_KEY',)
+
 
-from admin.core.config import settings
+def validate_environment():
+    """Check required environment variables before the settings are imported.
+    
+    Building the admin settings without a secret key fails with a validation
+    error during import, so the cheap check on os.environ runs first.
+    """
+    load_dotenv()
+    missing = [name for name in REQUIRED_ENV_VARS if not os.environ.get(name)]
+    
+    if missing:
+        raise ValueError(f"Missing required environment variables: {', '.join(missing)}")
 
 
-def validate_settings():
+def validate_settings(settings):
     """Validate required settings are present."""
     required = ['DB_HOST', 'DB_USER', 'DB_NAME', 'SECRET_KEY']
     missing = []
@@ -47,8 +75,28 @@ def validate_settings():
         raise ValueError(f"Missing required settings: {', '.join(missing)}")
 
 
-def main():
-    """Main entry point for the admin server."""
+def main(argv=None):
+    """Main entry point for the admin server.
+    
+    Args:
+        argv: Command-line arguments to parse (defaults to sys.argv[1:])
+    """
+    # Fail fast on a broken configuration before importing the server stack
+    try:
+        validate_environment()
+    except ValueError as e:
+        sys.exit(f"Configuration error: {e}")
+    
+    import uvicorn
+    
+    from admin.core.config import settings
+    
+    # Read the settings this function needs once; several are properties
+    default_host = settings.ADMIN_HOST
+    default_port = settings.actual_port
+    is_development = settings.is_development
+    is_production = settings.is_production
+    
     # Set up argument parser
     parser = argparse.ArgumentParser(
         description="Run the diabetes monitoring admin panel",
@@ -58,21 +106,21 @@ def main():
     
     parser.add_argument(
         "--host",
-        default=settings.ADMIN_HOST,
-        help=f"Host to bind to (default: {settings.ADMIN_HOST})"
+        default=default_host,
+        help=f"Host to bind to (default: {default_host})"
     )
     
     parser.add_argument(
         "--port",
         type=int,
-        default=settings.actual_port,
-        help=f"Port to bind to (default: {settings.actual_port})"
+        default=default_port,
+        help=f"Port to bind to (default: {default_port})"
     )
     
     parser.add_argument(
         "--reload",
         action="store_true",
-        default=settings.ENVIRONMENT.lower() == "dev",
+        default=is_development,
         help="Enable auto-reload (default: enabled in dev mode)"
     )
     
@@ -111,7 +159,7 @@ def main():
         help="Disable access log"
     )
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Set up logging
     logging.basicConfig(
@@ -125,7 +173,7 @@ def main():
     
     # Validate settings
     try:
-        validate_settings()
+        validate_settings(settings)
     except ValueError as e:
         logger.error(f"Configuration error: {e}")
         logger.error("Please check your environment variables and .env file")
@@ -139,6 +187,8 @@ def main():
         "reload": args.reload,
         "log_level": args.log_level,
         "access_log": args.access_log,
+        "lifespan": "on",  # Enable lifespan events
+        "interface": "asgi3",  # Use ASGI3 interface
     }
     
     # Add workers only if not in reload mode
@@ -152,15 +202,25 @@ def main():
         uvicorn_config["reload_delay"] = 0.25
         logger.info("Watching directories: admin, bot")
     
+    # Use the uvloop event loop and httptools parser in every environment, so
+    # development serves requests the same way production does
+    if FAST_SERVER_LIBS_AVAILABLE:
+        uvicorn_config.update({
+            "loop": "uvloop",
+            "http": "httptools",
+        })
+    else:
+        uvicorn_config.update({
+            "loop": "auto",
+            "http": "auto",
+        })
+        logger.info("uvloop/httptools not installed, letting uvicorn pick its defaults")
+    
     # Additional production configurations
-    if settings.ENVIRONMENT.lower() == "prod":
+    if is_production:
         # Use production-ready server settings
         uvicorn_config.update({
-            "loop": "uvloop",  # Use uvloop for better performance
-            "http": "httptools",  # Use httptools for better HTTP parsing
             "ws": "websockets",  # WebSocket support
-            "lifespan": "on",  # Enable lifespan events
-            "interface": "asgi3",  # Use ASGI3 interface
             "proxy_headers": True,  # Trust proxy headers (for reverse proxy)
             "forwarded_allow_ips": "*",  # Allow all IPs for proxy headers
         })
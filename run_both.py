@@ -4,9 +4,7 @@ import asyncio
 import logging
 import multiprocessing
 import os
-import sys
 import time
-import subprocess
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -15,7 +13,9 @@ logger = logging.getLogger(__name__)
 def run_bot():
     """Run the Telegram bot."""
     logger.info("Starting Telegram bot...")
-    subprocess.run([sys.executable, "run_bot.py"])
+    # Imported here so only the bot process loads the bot stack
+    from bot.main import main as bot_main
+    bot_main()
 
 
 def run_admin():
@@ -24,12 +24,16 @@ def run_admin():
     # Wait a bit for bot to start first
     time.sleep(3)
     port = os.getenv('PORT', '8000')
-    subprocess.run([sys.executable, "run_admin.py", "--host", "0.0.0.0", "--port", port])
+    from run_admin import main as admin_main
+    admin_main(["--host", "0.0.0.0", "--port", port])
 
 
 if __name__ == "__main__":
     logger.info("Starting both bot and admin services...")
     
+    # Start the bot in a fresh interpreter rather than a fork of this one
+    multiprocessing.set_start_method("spawn")
+    
     try:
         # Start bot in separate process
         bot_process = multiprocessing.Process(target=run_bot)
@@ -482,7 +482,7 @@ class HealthCheck:
     def generate_report(self) -> Dict:
         """Generate a comprehensive health report"""
         total_checks = len(self.results)
-        passed_checks = sum(1 for r in self.results if r["status"] == "PASS")
+        passed_checks = sum(r["status"] == "PASS" for r in self.results)
         failed_checks = total_checks - passed_checks
         
         health_score = (passed_checks / total_checks * 100) if total_checks > 0 else 0
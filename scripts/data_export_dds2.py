@@ -2,6 +2,7 @@
 
 This module handles exporting both legacy and DDS-2 questionnaire data.
 """
+from collections import Counter
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 import os
@@ -9,76 +10,129 @@ import logging
 
 # Check if visualization libraries are available
 try:
+    # Figures are drawn straight onto an Agg canvas; pyplot's global figure
+    # registry and backend selection are never needed for PNG exports
     import matplotlib.dates as mdates
-    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
     import pandas as pd
     GRAPHS_AVAILABLE = True
 except ImportError:
     GRAPHS_AVAILABLE = False
 
 import xml.etree.ElementTree as ET
-from xml.dom import minidom
+from xml.sax.saxutils import escape, quoteattr
 
 from bot_config.bot_constants import (
     XMLConstants, ExportSettings, BotSettings, GraphSettings, AlertSettings
 )
 from database.constants import QuestionTypes, ResponseValues
-from database.models import User, Response
+from database.helpers import ResponseRecord
+from database.models import User
 
 logger = logging.getLogger(__name__)
 
+# Chart color for each DDS-2 distress level (green, orange, red)
+DISTRESS_LEVEL_COLORS = {'low': '#2ecc71', 'moderate': '#f39c12', 'high': '#e74c3c'}
+
+# Y-axis ticks for the DDS-2 total score (2-12) and single-question (1-6) charts
+DDS2_TOTAL_SCORE_TICKS = tuple(range(2, 13))
+DDS2_QUESTION_SCORE_TICKS = tuple(range(1, 7))
+
+if GRAPHS_AVAILABLE:
+    # Built once per process. Only one timeline axis exists at a time (the
+    # shared figure is cleared between charts), so reusing them is safe
+    TIMELINE_DATE_FORMATTER = mdates.DateFormatter(BotSettings.DATE_FORMAT)
+    TIMELINE_DATE_LOCATOR = mdates.DayLocator(interval=GraphSettings.DATE_INTERVAL_DAYS)
+
+# One indented <response> element, filled in per row with str.format
+RESPONSE_XML_TEMPLATE = (
+    f"{XMLConstants.INDENT_SPACES * 2}<{XMLConstants.RESPONSE_ELEMENT}>\n"
+    f"{XMLConstants.INDENT_SPACES * 3}<{XMLConstants.TIMESTAMP_FIELD}>{{timestamp}}</{XMLConstants.TIMESTAMP_FIELD}>\n"
+    f"{XMLConstants.INDENT_SPACES * 3}<{XMLConstants.QUESTION_TYPE_FIELD}>{{question_type}}</{XMLConstants.QUESTION_TYPE_FIELD}>\n"
+    f"{XMLConstants.INDENT_SPACES * 3}<{XMLConstants.RESPONSE_VALUE_FIELD}>{{response_value}}</{XMLConstants.RESPONSE_VALUE_FIELD}>\n"
+    f"{XMLConstants.INDENT_SPACES * 2}</{XMLConstants.RESPONSE_ELEMENT}>\n"
+)
+
+# Question types and answers come from a small fixed vocabulary, so their
+# escaped text is computed once; unknown values fall back to escape()
+ESCAPED_XML_TEXT = {
+    value: escape(value)
+    for value in (
+        QuestionTypes.get_all_types()
+        + ResponseValues.get_boolean_values()
+        + ResponseValues.get_dds2_values()
+        + ResponseValues.get_rating_values()
+    )
+}
+
 
 class DDS2DataExporter:
     """Export handler that supports both legacy and DDS-2 data"""
     
-    def export_user_data(self, user: User, responses: List[Response], start_date: datetime, 
+    def export_user_data(self, user: User, responses: List[ResponseRecord], start_date: datetime, 
                          end_date: datetime, output_dir: str) -> str:
-        """Export user data to XML format with DDS-2 support"""
-        # Create root element
-        root = ET.Element(XMLConstants.ROOT_ELEMENT)
-        root.set(XMLConstants.GENERATED_ATTR, datetime.now().strftime(BotSettings.DATETIME_FORMAT))
-        root.set(XMLConstants.VERSION_ATTR, XMLConstants.VERSION)
-        
-        # Add user info
-        user_elem = ET.SubElement(root, XMLConstants.USER_ELEMENT)
+        """Export user data to XML format with DDS-2 support.
+        
+        The file is written incrementally: each section and each response is
+        serialized and written as soon as it is built, so the whole document
+        never exists in memory at once.
+        """
+        indent = XMLConstants.INDENT_SPACES
+        
+        # Build the small header sections
+        user_elem = ET.Element(XMLConstants.USER_ELEMENT)
         user_elem.set(XMLConstants.ID_FIELD, str(user.id))
         ET.SubElement(user_elem, XMLConstants.FIRST_NAME_FIELD).text = user.first_name
         ET.SubElement(user_elem, XMLConstants.FAMILY_NAME_FIELD).text = user.family_name
-        ET.SubElement(user_elem, XMLConstants.TELEGRAM_ID_FIELD).text = user.telegram_id
+        ET.SubElement(user_elem, XMLConstants.TELEGRAM_ID_FIELD).text = str(user.telegram_id)
         ET.SubElement(user_elem, XMLConstants.STATUS_FIELD).text = user.status.value
         ET.SubElement(user_elem, XMLConstants.REGISTRATION_DATE_FIELD).text = user.registration_date.strftime(BotSettings.DATETIME_FORMAT)
         
-        # Add export period
-        period_elem = ET.SubElement(root, XMLConstants.EXPORT_PERIOD_ELEMENT)
+        period_elem = ET.Element(XMLConstants.EXPORT_PERIOD_ELEMENT)
         ET.SubElement(period_elem, XMLConstants.START_DATE_FIELD).text = start_date.strftime(BotSettings.DATE_FORMAT)
         ET.SubElement(period_elem, XMLConstants.END_DATE_FIELD).text = end_date.strftime(BotSettings.DATE_FORMAT)
         
         # Calculate statistics for both legacy and DDS-2
         stats = self._calculate_statistics(responses, start_date, end_date)
         
-        # Add statistics
-        stats_elem = ET.SubElement(root, XMLConstants.STATISTICS_ELEMENT)
+        stats_elem = ET.Element(XMLConstants.STATISTICS_ELEMENT)
         for key, value in stats.items():
             if isinstance(value, float):
                 ET.SubElement(stats_elem, key).text = XMLConstants.PERCENTAGE_FORMAT.format(value)
             else:
                 ET.SubElement(stats_elem, key).text = str(value)
         
-        # Add responses
-        responses_elem = ET.SubElement(root, XMLConstants.RESPONSES_ELEMENT)
-        for response in responses:
-            response_elem = ET.SubElement(responses_elem, XMLConstants.RESPONSE_ELEMENT)
-            ET.SubElement(response_elem, XMLConstants.TIMESTAMP_FIELD).text = response.response_timestamp.strftime(BotSettings.DATETIME_FORMAT)
-            ET.SubElement(response_elem, XMLConstants.QUESTION_TYPE_FIELD).text = response.question_type
-            ET.SubElement(response_elem, XMLConstants.RESPONSE_VALUE_FIELD).text = response.response_value
-        
-        # Save XML
         xml_path = os.path.join(output_dir, ExportSettings.XML_FILENAME)
-        self._save_pretty_xml(root, xml_path)
+        with open(xml_path, 'w', encoding='utf-8') as f:
+            f.write(XMLConstants.XML_DECLARATION)
+            f.write(
+                f"<{XMLConstants.ROOT_ELEMENT}"
+                f" {XMLConstants.GENERATED_ATTR}={quoteattr(datetime.now().strftime(BotSettings.DATETIME_FORMAT))}"
+                f" {XMLConstants.VERSION_ATTR}={quoteattr(XMLConstants.VERSION)}>\n"
+            )
+            for section in (user_elem, period_elem, stats_elem):
+                self._write_element(f, section, level=1)
+            
+            # Every response has the same fixed shape, so responses skip
+            # ElementTree and are formatted from a template straight into the file.
+            # Responses are plain (timestamp, question_type, value) tuples, not ORM rows
+            f.write(f"{indent}<{XMLConstants.RESPONSES_ELEMENT}>\n")
+            f.writelines(
+                RESPONSE_XML_TEMPLATE.format(
+                    timestamp=timestamp.strftime(BotSettings.DATETIME_FORMAT),
+                    question_type=ESCAPED_XML_TEXT.get(question_type) or escape(question_type),
+                    response_value=ESCAPED_XML_TEXT.get(response_value) or escape(response_value)
+                )
+                for timestamp, question_type, response_value in responses
+            )
+            f.write(f"{indent}</{XMLConstants.RESPONSES_ELEMENT}>\n")
+            
+            f.write(f"</{XMLConstants.ROOT_ELEMENT}>\n")
         
         return xml_path
     
-    def _calculate_statistics(self, responses: List[Response], start_date: datetime, 
+    def _calculate_statistics(self, responses: List[ResponseRecord], start_date: datetime, 
                              end_date: datetime) -> Dict[str, any]:
         """Calculate statistics including DDS-2 metrics.
         
@@ -111,7 +165,7 @@ class DDS2DataExporter:
         
         return stats
     
-    def _group_responses_by_type(self, responses: List[Response]) -> Dict[str, List[Response]]:
+    def _group_responses_by_type(self, responses: List[ResponseRecord]) -> Dict[str, List[ResponseRecord]]:
         """Group responses by questionnaire type.
         
         Args:
@@ -120,14 +174,20 @@ class DDS2DataExporter:
         Returns:
             Dictionary with 'dds2' and 'legacy' response lists
         """
-        return {
-            'dds2': [r for r in responses if r.question_type in QuestionTypes.get_dds2_types()],
-            'legacy': [r for r in responses if r.question_type in [
-                QuestionTypes.DISTRESS_CHECK, QuestionTypes.SEVERITY_RATING
-            ]]
-        }
+        groups = {'dds2': [], 'legacy': []}
+        dds2_types = QuestionTypes.get_dds2_types()
+        legacy_types = (QuestionTypes.DISTRESS_CHECK, QuestionTypes.SEVERITY_RATING)
+        
+        # Sort every response into its group in one pass over the fetched rows
+        for r in responses:
+            if r.question_type in dds2_types:
+                groups['dds2'].append(r)
+            elif r.question_type in legacy_types:
+                groups['legacy'].append(r)
+        
+        return groups
     
-    def _group_dds2_sessions(self, responses: List[Response]) -> Dict[str, Dict[str, int]]:
+    def _group_dds2_sessions(self, responses: List[ResponseRecord]) -> Dict[str, Dict[str, int]]:
         """Group DDS-2 responses into sessions.
         
         Args:
@@ -171,7 +231,7 @@ class DDS2DataExporter:
         
         return total_scores, distress_levels
     
-    def _calculate_dds2_statistics(self, responses: List[Response], start_date: datetime, 
+    def _calculate_dds2_statistics(self, responses: List[ResponseRecord], start_date: datetime, 
                                   end_date: datetime) -> Dict[str, any]:
         """Calculate DDS-2 specific statistics.
         
@@ -212,92 +272,117 @@ class DDS2DataExporter:
         Returns:
             Dictionary of statistics
         """
+        sessions_completed = len(total_scores)
+        if not sessions_completed:
+            average_score = min_score = max_score = high_percentage = 0
+        else:
+            # Each reduction is a single C-level pass over a plain int list
+            average_score = sum(total_scores) / sessions_completed
+            min_score = min(total_scores)
+            max_score = max(total_scores)
+            high_percentage = distress_levels['high'] / sessions_completed * 100
+        
         return {
-            'dds2_sessions_completed': len(total_scores),
-            'dds2_average_score': sum(total_scores) / len(total_scores) if total_scores else 0,
-            'dds2_min_score': min(total_scores) if total_scores else 0,
-            'dds2_max_score': max(total_scores) if total_scores else 0,
+            'dds2_sessions_completed': sessions_completed,
+            'dds2_average_score': average_score,
+            'dds2_min_score': min_score,
+            'dds2_max_score': max_score,
             'dds2_low_distress_count': distress_levels['low'],
             'dds2_moderate_distress_count': distress_levels['moderate'],
             'dds2_high_distress_count': distress_levels['high'],
-            'dds2_high_distress_percentage': (
-                (distress_levels['high'] / len(total_scores) * 100) 
-                if total_scores else 0
-            )
+            'dds2_high_distress_percentage': high_percentage
         }
     
-    def _calculate_legacy_statistics(self, responses: List[Response], start_date: datetime, 
+    def _calculate_legacy_statistics(self, responses: List[ResponseRecord], start_date: datetime, 
                                     end_date: datetime) -> Dict[str, any]:
         """Calculate legacy questionnaire statistics"""
-        distress_responses = [r for r in responses if r.question_type == QuestionTypes.DISTRESS_CHECK]
-        severity_responses = [r for r in responses if r.question_type == QuestionTypes.SEVERITY_RATING]
-        
-        distress_count = sum(1 for r in distress_responses if r.response_value == ResponseValues.YES)
-        no_distress_count = sum(1 for r in distress_responses if r.response_value == ResponseValues.NO)
-        
-        severities = [int(r.response_value) for r in severity_responses]
+        # Tally (question, answer) pairs in one C-level pass; there are only a
+        # handful of distinct pairs, so everything else is derived from those
+        tally = Counter((r.question_type, r.response_value) for r in responses)
+        
+        distress_count = tally[(QuestionTypes.DISTRESS_CHECK, ResponseValues.YES)]
+        no_distress_count = tally[(QuestionTypes.DISTRESS_CHECK, ResponseValues.NO)]
+        distress_total = 0
+        severity_counts = {}
+        for (question_type, response_value), count in tally.items():
+            if question_type == QuestionTypes.DISTRESS_CHECK:
+                distress_total += count
+            elif question_type == QuestionTypes.SEVERITY_RATING:
+                severity = int(response_value)
+                severity_counts[severity] = severity_counts.get(severity, 0) + count
+        
+        severity_count = sum(severity_counts.values())
+        severity_sum = sum(severity * count for severity, count in severity_counts.items())
+        severity_min = min(severity_counts, default=0)
+        severity_max = max(severity_counts, default=0)
         
         stats = {
             XMLConstants.DISTRESS_COUNT_FIELD: distress_count,
             XMLConstants.NO_DISTRESS_COUNT_FIELD: no_distress_count,
-            XMLConstants.DISTRESS_PERCENTAGE_FIELD: (distress_count / len(distress_responses) * 100) if distress_responses else 0,
-            XMLConstants.AVERAGE_SEVERITY_FIELD: sum(severities) / len(severities) if severities else 0,
-            XMLConstants.MAX_SEVERITY_FIELD: max(severities) if severities else 0,
-            XMLConstants.MIN_SEVERITY_FIELD: min(severities) if severities else 0
+            XMLConstants.DISTRESS_PERCENTAGE_FIELD: (distress_count / distress_total * 100) if distress_total else 0,
+            XMLConstants.AVERAGE_SEVERITY_FIELD: severity_sum / severity_count if severity_count else 0,
+            XMLConstants.MAX_SEVERITY_FIELD: severity_max,
+            XMLConstants.MIN_SEVERITY_FIELD: severity_min
         }
         
         # Calculate response rate
         days = (end_date - start_date).days + 1
         expected_responses = days * AlertSettings.EXPECTED_RESPONSES_PER_DAY
-        stats[XMLConstants.RESPONSE_RATE_FIELD] = (len(distress_responses) / expected_responses * 100) if expected_responses > 0 else 0
+        stats[XMLConstants.RESPONSE_RATE_FIELD] = (distress_total / expected_responses * 100) if expected_responses > 0 else 0
         
         return stats
     
-    def generate_graphs(self, responses: List[Response], user: User, start_date: datetime, 
+    def generate_graphs(self, responses: List[ResponseRecord], user: User, start_date: datetime, 
                        end_date: datetime, output_dir: str):
         """Generate graphs supporting both legacy and DDS-2 data"""
         if not GRAPHS_AVAILABLE:
             print("Graphs not available. Install pandas and matplotlib.")
             return
         
-        # Check data type
-        has_dds2 = any(r.question_type in QuestionTypes.get_dds2_types() for r in responses)
-        has_legacy = any(r.question_type in [QuestionTypes.DISTRESS_CHECK, QuestionTypes.SEVERITY_RATING] for r in responses)
+        # Partition once; each graph helper only sees its own questionnaire
+        response_groups = self._group_responses_by_type(responses)
         
-        if has_dds2:
-            self._generate_dds2_graphs(responses, user, start_date, end_date, output_dir)
+        if response_groups['dds2']:
+            self._generate_dds2_graphs(response_groups['dds2'], user, start_date, end_date, output_dir)
         
-        if has_legacy:
-            self._generate_legacy_graphs(responses, user, start_date, end_date, output_dir)
+        if response_groups['legacy']:
+            self._generate_legacy_graphs(response_groups['legacy'], user, start_date, end_date, output_dir)
     
-    def _generate_dds2_graphs(self, responses: List[Response], user: User, start_date: datetime, 
+    def _generate_dds2_graphs(self, responses: List[ResponseRecord], user: User, start_date: datetime, 
                              end_date: datetime, output_dir: str):
         """Generate DDS-2 specific graphs"""
+        # One figure is cleared and reused for every chart. It is not
+        # registered with pyplot, so there is nothing to close afterwards
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        
         # 1. DDS-2 Total Score Timeline
         dds2_data = self._prepare_dds2_session_data(responses)
         if dds2_data:
-            self._plot_dds2_timeline(dds2_data, user, output_dir)
+            self._plot_dds2_timeline(fig, dds2_data, user, output_dir)
         
         # 2. Distress Level Distribution
-        self._plot_dds2_distribution(dds2_data, user, output_dir)
+        self._plot_dds2_distribution(fig, dds2_data, user, output_dir)
         
         # 3. Question-specific trends
-        self._plot_dds2_question_trends(responses, user, output_dir)
+        self._plot_dds2_question_trends(fig, responses, user, output_dir)
     
-    def _prepare_dds2_session_data(self, responses: List[Response]) -> List[Tuple[datetime, int, str]]:
-        """Prepare DDS-2 session data with timestamps, total scores, and distress levels"""
+    def _prepare_dds2_session_data(self, responses: List[ResponseRecord]) -> List[Tuple[datetime, int, str]]:
+        """Prepare DDS-2 session data with timestamps, total scores, and distress levels.
+        
+        Expects only DDS-2 responses, as partitioned by generate_graphs.
+        """
         sessions = {}
         
         for r in responses:
-            if r.question_type in QuestionTypes.get_dds2_types():
-                session_key = r.response_timestamp.strftime("%Y-%m-%d %H:%M")
-                if session_key not in sessions:
-                    sessions[session_key] = {'timestamp': r.response_timestamp}
-                
-                if r.question_type == QuestionTypes.DDS2_Q1_OVERWHELMED:
-                    sessions[session_key]['q1'] = int(r.response_value)
-                elif r.question_type == QuestionTypes.DDS2_Q2_FAILING:
-                    sessions[session_key]['q2'] = int(r.response_value)
+            session_key = r.response_timestamp.strftime("%Y-%m-%d %H:%M")
+            if session_key not in sessions:
+                sessions[session_key] = {'timestamp': r.response_timestamp}
+            
+            if r.question_type == QuestionTypes.DDS2_Q1_OVERWHELMED:
+                sessions[session_key]['q1'] = int(r.response_value)
+            elif r.question_type == QuestionTypes.DDS2_Q2_FAILING:
+                sessions[session_key]['q2'] = int(r.response_value)
         
         # Calculate total scores
         session_data = []
@@ -309,59 +394,52 @@ class DDS2DataExporter:
         
         return sorted(session_data, key=lambda x: x[0])
     
-    def _plot_dds2_timeline(self, session_data: List[Tuple[datetime, int, str]], user: User, output_dir: str):
+    def _plot_dds2_timeline(self, fig, session_data: List[Tuple[datetime, int, str]], user: User, output_dir: str):
         """Plot DDS-2 total score timeline"""
         if not session_data:
             return
         
         timestamps, scores, levels = zip(*session_data)
         
-        plt.figure(figsize=(12, 6))
+        fig.clf()
+        fig.set_size_inches(12, 6)
+        ax = fig.add_subplot()
         
         # Color points by distress level
-        colors = []
-        for level in levels:
-            if level == 'low':
-                colors.append('#2ecc71')  # Green
-            elif level == 'moderate':
-                colors.append('#f39c12')  # Orange
-            else:
-                colors.append('#e74c3c')  # Red
+        colors = [DISTRESS_LEVEL_COLORS[level] for level in levels]
         
-        plt.scatter(timestamps, scores, c=colors, s=100, alpha=0.7)
-        plt.plot(timestamps, scores, 'k-', alpha=0.3)
+        ax.scatter(timestamps, scores, c=colors, s=100, alpha=0.7)
+        ax.plot(timestamps, scores, 'k-', alpha=0.3)
         
         # Add threshold lines
-        plt.axhline(y=4, color='green', linestyle='--', alpha=0.5, label='Low distress threshold')
-        plt.axhline(y=8, color='orange', linestyle='--', alpha=0.5, label='Moderate distress threshold')
+        ax.axhline(y=4, color='green', linestyle='--', alpha=0.5, label='Low distress threshold')
+        ax.axhline(y=8, color='orange', linestyle='--', alpha=0.5, label='Moderate distress threshold')
         
-        plt.title(f'DDS-2 Total Score Timeline - {user.first_name} {user.family_name}')
-        plt.xlabel('Date')
-        plt.ylabel('DDS-2 Total Score (2-12)')
-        plt.ylim(1, 13)
-        plt.yticks(range(2, 13))
+        ax.set_title(f'DDS-2 Total Score Timeline - {user.first_name} {user.family_name}')
+        ax.set_xlabel('Date')
+        ax.set_ylabel('DDS-2 Total Score (2-12)')
+        ax.set_ylim(1, 13)
+        ax.set_yticks(DDS2_TOTAL_SCORE_TICKS)
         
         # Format x-axis
-        ax = plt.gca()
-        ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
-        ax.xaxis.set_major_locator(mdates.DayLocator(interval=7))
-        plt.xticks(rotation=45)
-        
-        plt.legend()
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, 'dds2_timeline.png'))
-        plt.close()
+        ax.xaxis.set_major_formatter(TIMELINE_DATE_FORMATTER)
+        ax.xaxis.set_major_locator(TIMELINE_DATE_LOCATOR)
+        ax.tick_params(axis='x', labelrotation=45)
+        
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+        fig.tight_layout()
+        fig.savefig(os.path.join(output_dir, 'dds2_timeline.png'))
     
-    def _plot_dds2_distribution(self, session_data: List[Tuple[datetime, int, str]], user: User, output_dir: str):
+    def _plot_dds2_distribution(self, fig, session_data: List[Tuple[datetime, int, str]], user: User, output_dir: str):
         """Plot distress level distribution pie chart"""
         if not session_data:
             return
         
         # Count distress levels
-        level_counts = {'Low': 0, 'Moderate': 0, 'High': 0}
+        level_counts = dict.fromkeys(DISTRESS_LEVEL_COLORS, 0)
         for _, _, level in session_data:
-            level_counts[level.capitalize()] += 1
+            level_counts[level] += 1
         
         # Filter out zero counts
         labels = []
@@ -370,83 +448,79 @@ class DDS2DataExporter:
         
         for level, count in level_counts.items():
             if count > 0:
-                labels.append(f'{level}\n({count} sessions)')
+                labels.append(f'{level.capitalize()}\n({count} sessions)')
                 sizes.append(count)
-                if level == 'Low':
-                    colors.append('#2ecc71')
-                elif level == 'Moderate':
-                    colors.append('#f39c12')
-                else:
-                    colors.append('#e74c3c')
+                colors.append(DISTRESS_LEVEL_COLORS[level])
         
         if not sizes:
             return
         
-        plt.figure(figsize=(8, 8))
-        plt.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
-        plt.title(f'DDS-2 Distress Level Distribution - {user.first_name} {user.family_name}')
-        plt.axis('equal')
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, 'dds2_distribution.png'))
-        plt.close()
+        fig.clf()
+        fig.set_size_inches(8, 8)
+        ax = fig.add_subplot()
+        ax.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
+        ax.set_title(f'DDS-2 Distress Level Distribution - {user.first_name} {user.family_name}')
+        ax.axis('equal')
+        fig.tight_layout()
+        fig.savefig(os.path.join(output_dir, 'dds2_distribution.png'))
     
-    def _plot_dds2_question_trends(self, responses: List[Response], user: User, output_dir: str):
+    def _plot_dds2_question_trends(self, fig, responses: List[ResponseRecord], user: User, output_dir: str):
         """Plot individual question trends"""
-        q1_data = [(r.response_timestamp, int(r.response_value)) 
-                   for r in responses if r.question_type == QuestionTypes.DDS2_Q1_OVERWHELMED]
-        q2_data = [(r.response_timestamp, int(r.response_value)) 
-                   for r in responses if r.question_type == QuestionTypes.DDS2_Q2_FAILING]
-        
-        if not q1_data and not q2_data:
+        # Responses arrive ordered by timestamp, so one pass fills both
+        # series already sorted, without building and unzipping tuples
+        q1_timestamps, q1_values = [], []
+        q2_timestamps, q2_values = [], []
+        for timestamp, question_type, response_value in responses:
+            if question_type == QuestionTypes.DDS2_Q1_OVERWHELMED:
+                q1_timestamps.append(timestamp)
+                q1_values.append(int(response_value))
+            elif question_type == QuestionTypes.DDS2_Q2_FAILING:
+                q2_timestamps.append(timestamp)
+                q2_values.append(int(response_value))
+        
+        if not q1_timestamps and not q2_timestamps:
             return
         
-        plt.figure(figsize=(12, 8))
+        fig.clf()
+        fig.set_size_inches(12, 8)
         
         # Plot Q1
-        if q1_data:
-            timestamps, values = zip(*sorted(q1_data))
-            plt.subplot(2, 1, 1)
-            plt.plot(timestamps, values, 'b-o', alpha=0.7, label='Q1: Overwhelmed')
-            plt.ylabel('Score (1-6)')
-            plt.ylim(0.5, 6.5)
-            plt.yticks(range(1, 7))
-            plt.title('Q1: Feeling overwhelmed by the demands of living with diabetes')
-            plt.grid(True, alpha=0.3)
-            plt.legend()
+        if q1_timestamps:
+            ax = fig.add_subplot(2, 1, 1)
+            ax.plot(q1_timestamps, q1_values, 'b-o', alpha=0.7, label='Q1: Overwhelmed')
+            ax.set_ylabel('Score (1-6)')
+            ax.set_ylim(0.5, 6.5)
+            ax.set_yticks(DDS2_QUESTION_SCORE_TICKS)
+            ax.set_title('Q1: Feeling overwhelmed by the demands of living with diabetes')
+            ax.grid(True, alpha=0.3)
+            ax.legend()
         
         # Plot Q2
-        if q2_data:
-            timestamps, values = zip(*sorted(q2_data))
-            plt.subplot(2, 1, 2)
-            plt.plot(timestamps, values, 'r-o', alpha=0.7, label='Q2: Failing')
-            plt.xlabel('Date')
-            plt.ylabel('Score (1-6)')
-            plt.ylim(0.5, 6.5)
-            plt.yticks(range(1, 7))
-            plt.title('Q2: Feeling that I am often failing with my diabetes regimen')
-            plt.grid(True, alpha=0.3)
-            plt.legend()
-        
-        plt.suptitle(f'DDS-2 Individual Question Trends - {user.first_name} {user.family_name}')
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, 'dds2_questions.png'))
-        plt.close()
+        if q2_timestamps:
+            ax = fig.add_subplot(2, 1, 2)
+            ax.plot(q2_timestamps, q2_values, 'r-o', alpha=0.7, label='Q2: Failing')
+            ax.set_xlabel('Date')
+            ax.set_ylabel('Score (1-6)')
+            ax.set_ylim(0.5, 6.5)
+            ax.set_yticks(DDS2_QUESTION_SCORE_TICKS)
+            ax.set_title('Q2: Feeling that I am often failing with my diabetes regimen')
+            ax.grid(True, alpha=0.3)
+            ax.legend()
+        
+        fig.suptitle(f'DDS-2 Individual Question Trends - {user.first_name} {user.family_name}')
+        fig.tight_layout()
+        fig.savefig(os.path.join(output_dir, 'dds2_questions.png'))
     
-    def _generate_legacy_graphs(self, responses: List[Response], user: User, start_date: datetime, 
+    def _generate_legacy_graphs(self, responses: List[ResponseRecord], user: User, start_date: datetime, 
                                end_date: datetime, output_dir: str):
         """Generate legacy questionnaire graphs (existing functionality)"""
         # Legacy graph generation not implemented yet
         # This is a placeholder for future migration of legacy visualization code
         logger.info(f"Legacy graph generation skipped for user {user.id} - not implemented")
     
-    def _save_pretty_xml(self, root, filepath):
-        """Save XML with pretty formatting"""
-        rough_string = ET.tostring(root, encoding='unicode')
-        reparsed = minidom.parseString(rough_string)
-        pretty_xml = reparsed.toprettyxml(indent=XMLConstants.INDENT_SPACES)
-        
-        # Remove extra blank lines
-        pretty_xml = '\n'.join([line for line in pretty_xml.split('\n') if line.strip()])
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(pretty_xml)
\ No newline at end of file
+    def _write_element(self, f, elem, level: int):
+        """Write one indented element (and its children) to an open XML file"""
+        ET.indent(elem, space=XMLConstants.INDENT_SPACES, level=level)
+        f.write(XMLConstants.INDENT_SPACES * level)
+        f.write(ET.tostring(elem, encoding='unicode'))
+        f.write("\n")